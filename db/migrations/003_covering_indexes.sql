@@ -0,0 +1,18 @@
+-- ============================================
+-- HumanSign Index Migration
+-- Covering indexes for the auth and dashboard hot queries
+-- ============================================
+
+-- Run outside a transaction block (CONCURRENTLY), e.g. psql -f.
+-- sessions (user_id, started_at DESC) and session_features (session_id)
+-- are already indexed by schema.sql (idx_sessions_user and the UNIQUE
+-- constraint), so only refresh tokens need work here.
+
+-- Refresh rotation looks tokens up by hash and checks expiry/revocation;
+-- carrying those columns in the index allows index-only lookups.
+-- Uniqueness stays enforced by the token_hash UNIQUE constraint.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_refresh_tokens_hash_covering
+    ON refresh_tokens (token_hash) INCLUDE (id, user_id, expires_at, revoked_at);
+
+-- Superseded by the covering index above
+DROP INDEX CONCURRENTLY IF EXISTS idx_refresh_tokens_hash;
@@ -12,9 +12,10 @@ Generates realistic keystroke timing patterns for 6 behavior classes:
 
 import argparse
 import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import numpy as np
 import pandas as pd
 
@@ -31,18 +32,180 @@ CLASSES = [
 
 CLASS_TO_ID = {c: i for i, c in enumerate(CLASSES)}
 
+# Letter key codes (A-Z), sampled uniformly for pasted/inserted text
+LETTER_KEYS = np.arange(65, 91, dtype=np.int16)
+
+
+# Key codes for typed text: space, backspace, A-Z, 0-9
+TYPED_KEYS = np.array([32, 8, *range(65, 91), *range(48, 58)], dtype=np.int16)
+
+
+def _key_weights(space: float, backspace: float = 0.0) -> np.ndarray:
+    """Sampling probabilities over TYPED_KEYS; each letter/digit has weight 1."""
+    weights = np.array([space, backspace, *([1.0] * 36)])
+    return weights / weights.sum()
+
+
+# Per-profile key distributions (space/backspace weights relative to a
+# single alphanumeric key)
+P_KEYS_ORGANIC = _key_weights(space=10, backspace=3)
+P_KEYS_FAST = _key_weights(space=12, backspace=2)
+P_KEYS_NONNATIVE = _key_weights(space=8)
+P_KEYS_CODING = _key_weights(space=5)
+
+# Common coding symbols
+CODING_SYMBOLS = np.array([
+    123, 125,  # { }
+    91, 93,    # [ ]
+    40, 41,    # ( )
+    59, 58,    # ; :
+    61,        # =
+    46,        # .
+    44,        # ,
+    39, 34,    # ' "
+    47,        # /
+    60, 62,    # < >
+], dtype=np.int16)
+
+# Key-code -> category lookup used for the key type ratio features, so all
+# ratios come out of a single table lookup + bincount instead of one
+# boolean mask per feature
+KEY_OTHER, KEY_BACKSPACE, KEY_TAB, KEY_CTRL, KEY_SYMBOL = range(5)
+N_KEY_CATEGORIES = 5
+
+_KEY_CATEGORY = np.full(256, KEY_OTHER, dtype=np.intp)
+_KEY_CATEGORY[33:48] = KEY_SYMBOL
+_KEY_CATEGORY[58:65] = KEY_SYMBOL
+_KEY_CATEGORY[8] = KEY_BACKSPACE
+_KEY_CATEGORY[9] = KEY_TAB
+_KEY_CATEGORY[17] = KEY_CTRL
+
+
+# Output column dtypes, in column order. Counts fit in int32 and the
+# model trains on float32 features.
+DATASET_SCHEMA = {
+    'session_id': np.int32,
+    'label': object,
+    'label_id': np.int32,
+    'total_keystrokes': np.int32,
+    'duration_ms': np.float32,
+    'avg_dwell_time': np.float32,
+    'std_dwell_time': np.float32,
+    'min_dwell_time': np.float32,
+    'max_dwell_time': np.float32,
+    'avg_flight_time': np.float32,
+    'std_flight_time': np.float32,
+    'min_flight_time': np.float32,
+    'max_flight_time': np.float32,
+    'zero_dwell_ratio': np.float32,
+    'zero_flight_ratio': np.float32,
+    'pause_count': np.int32,
+    'pause_ratio': np.float32,
+    'backspace_ratio': np.float32,
+    'tab_ratio': np.float32,
+    'ctrl_ratio': np.float32,
+    'symbol_ratio': np.float32,
+    'long_pause_count': np.int32,
+    'avg_long_pause': np.float32,
+    'burst_count': np.int32,
+}
+
 
 @dataclass
 class KeystrokeSession:
     """A single keystroke session with timing data."""
-    dwell_times: np.ndarray      # Key hold durations (ms)
-    flight_times: np.ndarray     # Time between keys (ms) 
-    key_codes: np.ndarray        # Key codes pressed
-    pause_positions: np.ndarray  # Indices where pauses occurred
+    dwell_times: np.ndarray      # Key hold durations (ms), float32
+    flight_times: np.ndarray     # Time between keys (ms), float32
+    key_codes: np.ndarray        # Key codes pressed, int16
+    pause_count: int             # Number of pauses
     label: str                   # Class label
 
 
-def generate_organic_human(n_samples: int, seed: int = 42) -> List[KeystrokeSession]:
+def _normal32(rng: np.random.Generator, loc: float, scale: float, size) -> np.ndarray:
+    """Normal draws generated directly as float32 (no float64 intermediate)."""
+    out = rng.standard_normal(size, dtype=np.float32)
+    out *= scale
+    out += loc
+    return out
+
+
+def _row_counts(mask: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Number of True entries in the first lengths[i] columns of each row."""
+    in_range = np.arange(mask.shape[1]) < lengths[:, None]
+    return np.count_nonzero(mask & in_range, axis=1)
+
+
+@dataclass(frozen=True)
+class TypingProfile:
+    """Timing and key distribution of a continuous-typing generator."""
+    n_keys: Tuple[int, int]                    # Session length range [low, high)
+    dwell: Tuple[float, float, float, float]   # Mean, std, clip min, clip max (ms)
+    flight: Tuple[float, float, float, float]  # Mean, std, clip min, clip max (ms)
+    pause_prob: float                          # Per-gap pause probability
+    pause_range: Tuple[float, float]           # Pause duration range (ms)
+    key_weights: np.ndarray                    # Probabilities over TYPED_KEYS
+
+
+PROFILE_ORGANIC = TypingProfile(
+    n_keys=(50, 300), dwell=(100, 30, 20, 400), flight=(80, 40, 10, 300),
+    pause_prob=0.05, pause_range=(500, 3000), key_weights=P_KEYS_ORGANIC,
+)
+# Flight minimum 5ms to avoid 0ms (paste)
+PROFILE_FAST = TypingProfile(
+    n_keys=(100, 400), dwell=(70, 15, 15, 150), flight=(40, 20, 5, 150),
+    pause_prob=0.02, pause_range=(300, 1000), key_weights=P_KEYS_FAST,
+)
+PROFILE_NONNATIVE = TypingProfile(
+    n_keys=(50, 250), dwell=(150, 40, 40, 600), flight=(120, 50, 20, 500),
+    pause_prob=0.08, pause_range=(400, 2000), key_weights=P_KEYS_NONNATIVE,
+)
+PROFILE_CODING = TypingProfile(
+    n_keys=(80, 400), dwell=(90, 25, 15, 350), flight=(70, 35, 5, 250),
+    pause_prob=0.10, pause_range=(1000, 5000), key_weights=P_KEYS_CODING,
+)
+
+
+def _generate_typing(
+    profile: TypingProfile,
+    n_samples: int,
+    rng: np.random.Generator,
+    label: str,
+) -> List[KeystrokeSession]:
+    """
+    Shared kernel for the continuous-typing generators.
+    
+    Every session's randomness is drawn in one call per quantity into
+    (n_samples, max_n) buffers; session i uses the first n_keys[i]
+    columns of each row.
+    """
+    n_keys_arr = rng.integers(*profile.n_keys, n_samples)
+    max_n = n_keys_arr.max()
+    
+    mean, std, lo, hi = profile.dwell
+    dwell_all = np.clip(_normal32(rng, mean, std, (n_samples, max_n)), lo, hi)
+    
+    mean, std, lo, hi = profile.flight
+    flight_all = np.clip(_normal32(rng, mean, std, (n_samples, max_n - 1)), lo, hi)
+    
+    pause_all = rng.random((n_samples, max_n - 1)) < profile.pause_prob
+    flight_all[pause_all] = rng.uniform(*profile.pause_range, pause_all.sum())
+    pause_counts = _row_counts(pause_all, n_keys_arr - 1)
+    
+    keys_all = rng.choice(TYPED_KEYS, (n_samples, max_n), p=profile.key_weights)
+    
+    return [
+        KeystrokeSession(
+            dwell_times=dwell_all[i, :n_keys],
+            flight_times=flight_all[i, :n_keys - 1],
+            key_codes=keys_all[i, :n_keys],
+            pause_count=int(pause_counts[i]),
+            label=label,
+        )
+        for i, n_keys in enumerate(n_keys_arr)
+    ]
+
+
+def generate_organic_human(n_samples: int, rng: np.random.Generator) -> List[KeystrokeSession]:
     """
     Generate natural human typing patterns.
     
@@ -52,44 +215,10 @@ def generate_organic_human(n_samples: int, seed: int = 42) -> List[KeystrokeSess
     - Thinking pauses: 5% probability, 500-3000ms
     - Backspace rate: 2-8%
     """
-    np.random.seed(seed)
-    sessions = []
-    
-    for i in range(n_samples):
-        n_keys = np.random.randint(50, 300)
-        
-        # Dwell times: natural variance
-        dwell = np.random.normal(100, 30, n_keys)
-        dwell = np.clip(dwell, 20, 400)
-        
-        # Flight times: rhythm with occasional pauses
-        flight = np.random.normal(80, 40, n_keys - 1)
-        flight = np.clip(flight, 10, 300)
-        
-        # Add thinking pauses (5% probability)
-        pause_mask = np.random.random(len(flight)) < 0.05
-        pause_positions = np.where(pause_mask)[0]
-        flight[pause_mask] = np.random.uniform(500, 3000, pause_mask.sum())
-        
-        # Key codes (alphanumeric + common keys)
-        # 65-90: A-Z, 48-57: 0-9, 32: space, 8: backspace
-        key_codes = np.random.choice(
-            list(range(65, 91)) + list(range(48, 58)) + [32] * 10 + [8] * 3,
-            n_keys
-        )
-        
-        sessions.append(KeystrokeSession(
-            dwell_times=dwell,
-            flight_times=flight,
-            key_codes=key_codes,
-            pause_positions=pause_positions,
-            label='human_organic'
-        ))
-    
-    return sessions
+    return _generate_typing(PROFILE_ORGANIC, n_samples, rng, 'human_organic')
 
 
-def generate_fast_human(n_samples: int, seed: int = 42) -> List[KeystrokeSession]:
+def generate_fast_human(n_samples: int, rng: np.random.Generator) -> List[KeystrokeSession]:
     """
     Generate fast human typing patterns (Pro/Gamer/Fast Typist).
     
@@ -98,41 +227,11 @@ def generate_fast_human(n_samples: int, seed: int = 42) -> List[KeystrokeSession
     - Short flight times (~40ms), often overlapping (rollover)
     - Higher burst count, but consistent variance
     """
-    np.random.seed(seed)
-    sessions = []
-    
-    for i in range(n_samples):
-        n_keys = np.random.randint(100, 400)
-        
-        # Fast typing: shorter dwell
-        dwell = np.random.normal(70, 15, n_keys)
-        dwell = np.clip(dwell, 15, 150)
-        
-        # Fast flight (rollover typing)
-        flight = np.random.normal(40, 20, n_keys - 1)
-        flight = np.clip(flight, 5, 150) # Minimum 5ms to avoid 0ms (paste)
-        
-        # Occasional micro-pauses (thinking)
-        pause_mask = np.random.random(len(flight)) < 0.02
-        flight[pause_mask] = np.random.uniform(300, 1000, pause_mask.sum())
-        
-        key_codes = np.random.choice(
-            list(range(65, 91)) + list(range(48, 58)) + [32] * 12 + [8] * 2,
-            n_keys
-        )
-        
-        sessions.append(KeystrokeSession(
-            dwell_times=dwell,
-            flight_times=flight,
-            key_codes=key_codes,
-            pause_positions=np.where(pause_mask)[0],
-            label='human_organic' # Improve robustness of organic class
-        ))
-    
-    return sessions
+    # Labelled organic to improve robustness of that class
+    return _generate_typing(PROFILE_FAST, n_samples, rng, 'human_organic')
 
 
-def generate_paste(n_samples: int, seed: int = 42) -> List[KeystrokeSession]:
+def generate_paste(n_samples: int, rng: np.random.Generator) -> List[KeystrokeSession]:
     """
     Generate paste event patterns.
     
@@ -141,49 +240,50 @@ def generate_paste(n_samples: int, seed: int = 42) -> List[KeystrokeSession]:
     - Preceded by Ctrl key pattern
     - Large blocks appear instantly
     """
-    np.random.seed(seed)
     sessions = []
     
     for i in range(n_samples):
         # Mix of typed intro + paste block
-        n_typed = np.random.randint(5, 20)  # Small typed portion
-        n_pasted = np.random.randint(50, 500)  # Large paste block
+        n_typed = rng.integers(5, 20)  # Small typed portion
+        n_pasted = rng.integers(50, 500)  # Large paste block
         n_keys = n_typed + n_pasted + 2  # +2 for Ctrl+V
         
-        dwell = np.zeros(n_keys)
-        flight = np.zeros(n_keys - 1)
+        # Every element is written below; only the pasted tail needs zeros
+        dwell = np.empty(n_keys, dtype=np.float32)
+        flight = np.empty(n_keys - 1, dtype=np.float32)
         
         # Typed portion has normal timing
-        dwell[:n_typed] = np.random.normal(100, 30, n_typed)
-        flight[:n_typed-1] = np.random.normal(80, 40, max(1, n_typed-1))
+        dwell[:n_typed] = rng.normal(100, 30, n_typed)
+        flight[:n_typed-1] = rng.normal(80, 40, max(1, n_typed-1))
         
         # Ctrl+V keys (indices n_typed, n_typed+1)
-        dwell[n_typed] = np.random.uniform(80, 150)  # Ctrl hold
-        dwell[n_typed + 1] = np.random.uniform(50, 100)  # V key
-        flight[n_typed-1:n_typed+1] = np.random.uniform(20, 80, 2)
+        dwell[n_typed] = rng.uniform(80, 150)  # Ctrl hold
+        dwell[n_typed + 1] = rng.uniform(50, 100)  # V key
+        flight[n_typed-1:n_typed+1] = rng.uniform(20, 80, 2)
         
         # Pasted content: zero timing (instant appearance)
-        # Already zeros from initialization
+        dwell[n_typed + 2:] = 0
+        flight[n_typed + 1:] = 0
         
         # Key codes
-        key_codes = np.zeros(n_keys, dtype=int)
-        key_codes[:n_typed] = np.random.choice(range(65, 91), n_typed)
+        key_codes = np.empty(n_keys, dtype=np.int16)
+        key_codes[:n_typed] = rng.choice(LETTER_KEYS, n_typed)
         key_codes[n_typed] = 17  # Ctrl
         key_codes[n_typed + 1] = 86  # V
-        key_codes[n_typed + 2:] = np.random.choice(range(65, 91), n_pasted)
+        key_codes[n_typed + 2:] = rng.choice(LETTER_KEYS, n_pasted)
         
         sessions.append(KeystrokeSession(
             dwell_times=dwell,
             flight_times=flight,
             key_codes=key_codes,
-            pause_positions=np.array([n_typed]),  # Pause before paste
+            pause_count=1,  # Pause before paste
             label='paste'
         ))
     
     return sessions
 
 
-def generate_ai_assisted(n_samples: int, seed: int = 42) -> List[KeystrokeSession]:
+def generate_ai_assisted(n_samples: int, rng: np.random.Generator) -> List[KeystrokeSession]:
     """
     Generate AI autocomplete acceptance patterns (like GitHub Copilot).
     
@@ -191,63 +291,63 @@ def generate_ai_assisted(n_samples: int, seed: int = 42) -> List[KeystrokeSessio
     - Normal typing → pause → Tab/Enter → bulk insertion → resume typing
     - Inserted text has zero/near-zero timing
     """
-    np.random.seed(seed)
     sessions = []
     
     for i in range(n_samples):
         # Phase 1: Organic typing
-        n_typed1 = np.random.randint(15, 40)
+        n_typed1 = rng.integers(15, 40)
         # Phase 2: AI suggestion accepted
-        n_inserted = np.random.randint(20, 100)
+        n_inserted = rng.integers(20, 100)
         # Phase 3: Continue typing
-        n_typed2 = np.random.randint(10, 30)
+        n_typed2 = rng.integers(10, 30)
         
         n_keys = n_typed1 + 1 + n_inserted + n_typed2  # +1 for Tab
         
-        dwell = np.zeros(n_keys)
-        flight = np.zeros(n_keys - 1)
+        # Every element is written by one of the phases below
+        dwell = np.empty(n_keys, dtype=np.float32)
+        flight = np.empty(n_keys - 1, dtype=np.float32)
         
         # Phase 1: Normal typing
-        dwell[:n_typed1] = np.random.normal(100, 30, n_typed1)
-        flight[:n_typed1-1] = np.random.normal(80, 40, max(1, n_typed1-1))
+        dwell[:n_typed1] = rng.normal(100, 30, n_typed1)
+        flight[:n_typed1-1] = rng.normal(80, 40, max(1, n_typed1-1))
         
         # Pause before AI suggestion appears
-        flight[n_typed1 - 1] = np.random.uniform(200, 800)
+        flight[n_typed1 - 1] = rng.uniform(200, 800)
         
         # Tab to accept
-        dwell[n_typed1] = np.random.uniform(50, 120)
-        flight[n_typed1] = np.random.uniform(30, 100)
+        dwell[n_typed1] = rng.uniform(50, 120)
+        flight[n_typed1] = rng.uniform(30, 100)
         
         # AI-inserted content: very fast (near-zero)
         start = n_typed1 + 1
         end = start + n_inserted
-        dwell[start:end] = np.random.uniform(0, 5, n_inserted)
-        flight[start:end-1] = np.random.uniform(0, 5, n_inserted - 1)
+        dwell[start:end] = rng.uniform(0, 5, n_inserted)
+        flight[start:end-1] = rng.uniform(0, 5, n_inserted - 1)
         
         # Phase 3: Resume normal typing
-        flight[end - 1] = np.random.uniform(100, 300)  # Small pause after insertion
-        dwell[end:] = np.random.normal(100, 30, n_typed2)
-        flight[end:n_keys-1] = np.random.normal(80, 40, n_keys - 1 - end)
+        flight[end - 1] = rng.uniform(100, 300)  # Small pause after insertion
+        dwell[end:] = rng.normal(100, 30, n_typed2)
+        flight[end:n_keys-1] = rng.normal(80, 40, n_keys - 1 - end)
         
         # Key codes
-        key_codes = np.zeros(n_keys, dtype=int)
-        key_codes[:n_typed1] = np.random.choice(range(65, 91), n_typed1)
+        key_codes = np.empty(n_keys, dtype=np.int16)
+        key_codes[:n_typed1] = rng.choice(LETTER_KEYS, n_typed1)
         key_codes[n_typed1] = 9  # Tab
-        key_codes[start:end] = np.random.choice(range(65, 91), n_inserted)
-        key_codes[end:] = np.random.choice(range(65, 91), n_typed2)
+        key_codes[start:end] = rng.choice(LETTER_KEYS, n_inserted)
+        key_codes[end:] = rng.choice(LETTER_KEYS, n_typed2)
         
         sessions.append(KeystrokeSession(
             dwell_times=dwell,
             flight_times=flight,
             key_codes=key_codes,
-            pause_positions=np.array([n_typed1 - 1]),
+            pause_count=1,  # Pause before the suggestion
             label='ai_assisted'
         ))
     
     return sessions
 
 
-def generate_copy_paste_hybrid(n_samples: int, seed: int = 42) -> List[KeystrokeSession]:
+def generate_copy_paste_hybrid(n_samples: int, rng: np.random.Generator) -> List[KeystrokeSession]:
     """
     Generate mixed typing and paste behavior.
     
@@ -255,50 +355,53 @@ def generate_copy_paste_hybrid(n_samples: int, seed: int = 42) -> List[Keystroke
     - Interleaved organic typing and paste events
     - 20-60% content is pasted
     """
-    np.random.seed(seed)
     sessions = []
     
     for i in range(n_samples):
-        n_segments = np.random.randint(3, 7)
-        all_dwell = []
-        all_flight = []
-        all_keys = []
-        pause_positions = []
-        
-        for seg in range(n_segments):
-            is_paste = np.random.random() < 0.4  # 40% paste segments
-            
-            if is_paste:
-                n_chars = np.random.randint(20, 100)
-                # Ctrl+V + pasted content
-                all_dwell.extend([80, 60] + [0] * n_chars)
-                all_flight.extend([50, 30] + [0] * (n_chars - 1))
-                all_keys.extend([17, 86] + list(np.random.choice(range(65, 91), n_chars)))
-                pause_positions.append(len(all_dwell) - n_chars - 2)
+        n_segments = rng.integers(3, 7)
+        
+        # Draw segment layout up front: 40% paste segments (Ctrl+V + content)
+        is_paste = rng.random(n_segments) < 0.4
+        n_chars = np.where(
+            is_paste,
+            rng.integers(20, 100, n_segments),
+            rng.integers(20, 60, n_segments),
+        )
+        seg_len = n_chars + 2 * is_paste
+        ends = np.cumsum(seg_len)
+        starts = ends - seg_len
+        total = int(ends[-1])
+        
+        dwell = np.empty(total, dtype=np.float32)
+        flight = np.empty(total - 1, dtype=np.float32)
+        key_codes = rng.choice(LETTER_KEYS, total)
+        
+        for start, end, paste in zip(starts, ends, is_paste):
+            if paste:
+                dwell[start:start + 2] = (80, 60)
+                dwell[start + 2:end] = 0
+                flight[start:start + 2] = (50, 30)
+                flight[start + 2:end - 1] = 0
+                key_codes[start:start + 2] = (17, 86)
             else:
-                n_chars = np.random.randint(20, 60)
-                dwell = np.random.normal(100, 30, n_chars)
-                flight = np.random.normal(80, 40, n_chars - 1)
-                all_dwell.extend(dwell.tolist())
-                all_flight.extend(flight.tolist())
-                all_keys.extend(list(np.random.choice(range(65, 91), n_chars)))
-            
-            # Add inter-segment gap
-            if seg < n_segments - 1 and len(all_flight) > 0:
-                all_flight.append(np.random.uniform(200, 800))
+                dwell[start:end] = rng.normal(100, 30, end - start)
+                flight[start:end - 1] = rng.normal(80, 40, end - start - 1)
+        
+        # Inter-segment gaps
+        flight[ends[:-1] - 1] = rng.uniform(200, 800, n_segments - 1)
         
         sessions.append(KeystrokeSession(
-            dwell_times=np.array(all_dwell),
-            flight_times=np.array(all_flight[:len(all_dwell) - 1]),
-            key_codes=np.array(all_keys),
-            pause_positions=np.array(pause_positions),
+            dwell_times=dwell,
+            flight_times=flight,
+            key_codes=key_codes,
+            pause_count=int(is_paste.sum()),
             label='copy_paste_hybrid'
         ))
     
     return sessions
 
 
-def generate_nonnative(n_samples: int, seed: int = 42) -> List[KeystrokeSession]:
+def generate_nonnative(n_samples: int, rng: np.random.Generator) -> List[KeystrokeSession]:
     """
     Generate non-native English speaker typing patterns.
     
@@ -308,48 +411,19 @@ def generate_nonnative(n_samples: int, seed: int = 42) -> List[KeystrokeSession]
     - Higher backspace rate (5-15%)
     - Still shows natural human variance
     """
-    np.random.seed(seed)
-    sessions = []
+    sessions = _generate_typing(PROFILE_NONNATIVE, n_samples, rng, 'human_nonnative')
     
-    for i in range(n_samples):
-        n_keys = np.random.randint(50, 250)
-        
-        # Slower, more deliberate typing
-        dwell = np.random.normal(150, 40, n_keys)
-        dwell = np.clip(dwell, 40, 600)
-        
-        flight = np.random.normal(120, 50, n_keys - 1)
-        flight = np.clip(flight, 20, 500)
-        
-        # More pauses (hesitation)
-        pause_mask = np.random.random(len(flight)) < 0.08
-        pause_positions = np.where(pause_mask)[0]
-        flight[pause_mask] = np.random.uniform(400, 2000, pause_mask.sum())
-        
-        # Higher backspace rate
-        backspace_rate = np.random.uniform(0.05, 0.15)
-        n_backspace = int(n_keys * backspace_rate)
-        
-        key_codes = np.random.choice(
-            list(range(65, 91)) + list(range(48, 58)) + [32] * 8,
-            n_keys
-        )
-        # Insert backspaces
-        backspace_positions = np.random.choice(n_keys, n_backspace, replace=False)
-        key_codes[backspace_positions] = 8
-        
-        sessions.append(KeystrokeSession(
-            dwell_times=dwell,
-            flight_times=flight,
-            key_codes=key_codes,
-            pause_positions=pause_positions,
-            label='human_nonnative'
-        ))
+    # Higher backspace rate
+    backspace_rates = rng.uniform(0.05, 0.15, n_samples)
+    for session, rate in zip(sessions, backspace_rates):
+        n_keys = len(session.key_codes)
+        backspace_positions = rng.choice(n_keys, int(n_keys * rate), replace=False)
+        session.key_codes[backspace_positions] = 8
     
     return sessions
 
 
-def generate_coding(n_samples: int, seed: int = 42) -> List[KeystrokeSession]:
+def generate_coding(n_samples: int, rng: np.random.Generator) -> List[KeystrokeSession]:
     """
     Generate programming/coding typing patterns.
     
@@ -359,150 +433,205 @@ def generate_coding(n_samples: int, seed: int = 42) -> List[KeystrokeSession]:
     - Tab/Space clusters (indentation)
     - Long thinking pauses
     """
-    np.random.seed(seed)
-    sessions = []
+    sessions = _generate_typing(PROFILE_CODING, n_samples, rng, 'human_coding')
     
-    # Common coding symbols
-    SYMBOLS = [
-        123, 125,  # { }
-        91, 93,    # [ ]
-        40, 41,    # ( )
-        59, 58,    # ; :
-        61,        # =
-        46,        # .
-        44,        # ,
-        39, 34,    # ' "
-        47,        # /
-        60, 62,    # < >
-    ]
+    # High symbol ratio and tab clusters (indentation)
+    symbol_ratios = rng.uniform(0.2, 0.4, n_samples)
+    tab_counts = rng.integers(5, 20, n_samples)
     
-    for i in range(n_samples):
-        n_keys = np.random.randint(80, 400)
-        
-        # Faster bursts with longer pauses
-        dwell = np.random.normal(90, 25, n_keys)
-        dwell = np.clip(dwell, 15, 350)
-        
-        flight = np.random.normal(70, 35, n_keys - 1)
-        flight = np.clip(flight, 5, 250)
-        
-        # More frequent long pauses (thinking about logic)
-        pause_mask = np.random.random(len(flight)) < 0.10
-        pause_positions = np.where(pause_mask)[0]
-        flight[pause_mask] = np.random.uniform(1000, 5000, pause_mask.sum())
-        
-        # High symbol ratio
-        symbol_ratio = np.random.uniform(0.2, 0.4)
-        n_symbols = int(n_keys * symbol_ratio)
-        
-        # Tab clusters (indentation)
-        n_tabs = np.random.randint(5, 20)
-        
-        # Key distribution
-        key_codes = np.random.choice(
-            list(range(65, 91)) + list(range(48, 58)) + [32] * 5,  # Letters + nums + space
-            n_keys
-        )
+    for session, symbol_ratio, n_tabs in zip(sessions, symbol_ratios, tab_counts):
+        key_codes = session.key_codes
+        n_keys = len(key_codes)
         
         # Insert symbols
-        symbol_positions = np.random.choice(n_keys, n_symbols, replace=False)
-        key_codes[symbol_positions] = np.random.choice(SYMBOLS, n_symbols)
+        n_symbols = int(n_keys * symbol_ratio)
+        symbol_positions = rng.choice(n_keys, n_symbols, replace=False)
+        key_codes[symbol_positions] = rng.choice(CODING_SYMBOLS, n_symbols)
         
         # Insert tabs
-        tab_positions = np.random.choice(n_keys, min(n_tabs, n_keys), replace=False)
+        tab_positions = rng.choice(n_keys, min(n_tabs, n_keys), replace=False)
         key_codes[tab_positions] = 9
-        
-        sessions.append(KeystrokeSession(
-            dwell_times=dwell,
-            flight_times=flight,
-            key_codes=key_codes,
-            pause_positions=pause_positions,
-            label='human_coding'
-        ))
     
     return sessions
 
 
+def segment_reduce(
+    ufunc: np.ufunc,
+    values: np.ndarray,
+    lengths: np.ndarray,
+    dtype=np.float64,
+) -> np.ndarray:
+    """
+    Reduce consecutive segments of values (segment i has lengths[i]
+    elements) with ufunc.reduceat. Empty segments reduce to 0.
+    """
+    out = np.zeros(len(lengths), dtype=dtype)
+    nonempty = lengths > 0
+    if values.size:
+        starts = (np.cumsum(lengths) - lengths)[nonempty]
+        out[nonempty] = ufunc.reduceat(values, starts, axis=0, dtype=dtype)
+    return out
+
+
+def _segment_stats(
+    values: np.ndarray,
+    lengths: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Per-segment mean, std, min and max (0.0 for empty segments)."""
+    safe_lengths = np.maximum(lengths, 1)
+    
+    mean = segment_reduce(np.add, values, lengths) / safe_lengths
+    dev = values - np.repeat(mean, lengths)
+    std = np.sqrt(segment_reduce(np.add, dev * dev, lengths) / safe_lengths)
+    
+    mins = segment_reduce(np.minimum, values, lengths)
+    maxs = segment_reduce(np.maximum, values, lengths)
+    
+    return mean, std, mins, maxs
+
+
 def sessions_to_dataframe(sessions: List[KeystrokeSession]) -> pd.DataFrame:
-    """Convert sessions to training DataFrame format."""
-    records = []
-    
-    for idx, session in enumerate(sessions):
-        record = {
-            'session_id': idx,
-            'label': session.label,
-            'label_id': CLASS_TO_ID[session.label],
-            'total_keystrokes': len(session.dwell_times),
-            'duration_ms': float(np.sum(session.dwell_times) + np.sum(session.flight_times)),
-        }
-        
-        # Timing stats
-        dwells = session.dwell_times[session.dwell_times > 0]  # Exclude zeros
-        flights = session.flight_times[session.flight_times > 0]
-        
-        if len(dwells) > 0:
-            record['avg_dwell_time'] = float(np.mean(dwells))
-            record['std_dwell_time'] = float(np.std(dwells))
-            record['min_dwell_time'] = float(np.min(dwells))
-            record['max_dwell_time'] = float(np.max(dwells))
-        else:
-            record['avg_dwell_time'] = 0.0
-            record['std_dwell_time'] = 0.0
-            record['min_dwell_time'] = 0.0
-            record['max_dwell_time'] = 0.0
-        
-        if len(flights) > 0:
-            record['avg_flight_time'] = float(np.mean(flights))
-            record['std_flight_time'] = float(np.std(flights))
-            record['min_flight_time'] = float(np.min(flights))
-            record['max_flight_time'] = float(np.max(flights))
-        else:
-            record['avg_flight_time'] = 0.0
-            record['std_flight_time'] = 0.0
-            record['min_flight_time'] = 0.0
-            record['max_flight_time'] = 0.0
-        
+    """
+    Convert sessions to training DataFrame format.
+    
+    All sessions are concatenated into flat arrays and addressed by
+    per-session lengths (CSR-style offsets), so each feature is a single
+    ufunc.reduceat over the whole batch rather than a handful of NumPy
+    calls per session, with no padding for the varying session lengths.
+    """
+    n = len(sessions)
+    
+    dwell_len = np.fromiter((len(s.dwell_times) for s in sessions), dtype=np.int64, count=n)
+    flight_len = np.fromiter((len(s.flight_times) for s in sessions), dtype=np.int64, count=n)
+    dwell_all = np.concatenate([s.dwell_times for s in sessions])
+    flight_all = np.concatenate([s.flight_times for s in sessions])
+    keys_all = np.concatenate([s.key_codes for s in sessions])
+    
+    session_idx = np.arange(n)
+    dwell_counts = np.maximum(dwell_len, 1)
+    flight_counts = np.maximum(flight_len, 1)
+    
+    def count(mask: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        return segment_reduce(np.add, mask, lengths, dtype=np.int64)
+    
+    # Timing stats (zeros excluded); filtering keeps session order, so the
+    # filtered segments are addressed by per-session match counts
+    positive = dwell_all > 0
+    avg_dwell, std_dwell, min_dwell, max_dwell = _segment_stats(
+        dwell_all[positive], count(positive, dwell_len)
+    )
+    positive = flight_all > 0
+    avg_flight, std_flight, min_flight, max_flight = _segment_stats(
+        flight_all[positive], count(positive, flight_len)
+    )
+    
+    # Long pause features
+    long_mask = flight_all > 500
+    long_pause_count = count(long_mask, flight_len)
+    avg_long_pause, _, _, _ = _segment_stats(flight_all[long_mask], long_pause_count)
+    
+    # Burst detection (consecutive fast keystrokes): count rising edges,
+    # treating the start of every session as a non-fast predecessor
+    fast_mask = (flight_all < 50).astype(np.int8)
+    edges = np.diff(fast_mask, prepend=0)
+    starts = (np.cumsum(flight_len) - flight_len)[flight_len > 0]
+    edges[starts] = fast_mask[starts]
+    burst_count = count(edges == 1, flight_len)
+    
+    # Key type counts: (n_sessions, N_KEY_CATEGORIES)
+    key_onehot = _KEY_CATEGORY[keys_all][:, None] == np.arange(N_KEY_CATEGORIES)
+    key_counts = np.zeros((n, N_KEY_CATEGORIES), dtype=np.int64)
+    nonempty = dwell_len > 0
+    key_counts[nonempty] = np.add.reduceat(
+        key_onehot, (np.cumsum(dwell_len) - dwell_len)[nonempty], axis=0, dtype=np.int64
+    )
+    key_ratios = key_counts / dwell_counts[:, None]
+    
+    labels = [s.label for s in sessions]
+    pause_count = np.fromiter((s.pause_count for s in sessions), dtype=np.int64, count=n)
+    
+    columns = {
+        'session_id': session_idx,
+        'label': labels,
+        'label_id': [CLASS_TO_ID[label] for label in labels],
+        'total_keystrokes': dwell_len,
+        'duration_ms': (
+            segment_reduce(np.add, dwell_all, dwell_len)
+            + segment_reduce(np.add, flight_all, flight_len)
+        ),
+        'avg_dwell_time': avg_dwell,
+        'std_dwell_time': std_dwell,
+        'min_dwell_time': min_dwell,
+        'max_dwell_time': max_dwell,
+        'avg_flight_time': avg_flight,
+        'std_flight_time': std_flight,
+        'min_flight_time': min_flight,
+        'max_flight_time': max_flight,
         # Special features
-        record['zero_dwell_ratio'] = float(np.mean(session.dwell_times == 0))
-        record['zero_flight_ratio'] = float(np.mean(session.flight_times == 0))
-        record['pause_count'] = len(session.pause_positions)
-        record['pause_ratio'] = len(session.pause_positions) / max(len(session.flight_times), 1)
-        
+        'zero_dwell_ratio': count(dwell_all == 0, dwell_len) / dwell_counts,
+        'zero_flight_ratio': count(flight_all == 0, flight_len) / flight_counts,
+        'pause_count': pause_count,
+        'pause_ratio': pause_count / flight_counts,
         # Key type ratios
-        keys = session.key_codes
-        record['backspace_ratio'] = float(np.mean(keys == 8))
-        record['tab_ratio'] = float(np.mean(keys == 9))
-        record['ctrl_ratio'] = float(np.mean(keys == 17))
-        record['symbol_ratio'] = float(np.mean((keys >= 33) & (keys <= 47) | (keys >= 58) & (keys <= 64)))
-        
-        # Long pause features
-        long_pauses = session.flight_times[session.flight_times > 500]
-        record['long_pause_count'] = len(long_pauses)
-        record['avg_long_pause'] = float(np.mean(long_pauses)) if len(long_pauses) > 0 else 0.0
-        
-        # Burst detection (consecutive fast keystrokes)
-        fast_mask = session.flight_times < 50
-        burst_count = 0
-        in_burst = False
-        for is_fast in fast_mask:
-            if is_fast and not in_burst:
-                burst_count += 1
-                in_burst = True
-            elif not is_fast:
-                in_burst = False
-        record['burst_count'] = burst_count
-        
-        records.append(record)
+        'backspace_ratio': key_ratios[:, KEY_BACKSPACE],
+        'tab_ratio': key_ratios[:, KEY_TAB],
+        'ctrl_ratio': key_ratios[:, KEY_CTRL],
+        'symbol_ratio': key_ratios[:, KEY_SYMBOL],
+        'long_pause_count': long_pause_count,
+        'avg_long_pause': avg_long_pause,
+        'burst_count': burst_count,
+    }
     
-    return pd.DataFrame(records)
+    # Cast each column straight to its schema dtype so pandas skips
+    # dtype inference and wraps the arrays as-is
+    return pd.DataFrame(
+        {col: np.asarray(columns[col], dtype=dtype) for col, dtype in DATASET_SCHEMA.items()},
+        copy=False,
+    )
+
+
+def _generate_class(
+    class_name: str,
+    n_samples: int,
+    seed_seq: np.random.SeedSequence,
+) -> List[KeystrokeSession]:
+    """Generate all sessions for one class from its own seed stream."""
+    rng = np.random.Generator(np.random.PCG64(seed_seq))
+    print(f"Generating {n_samples} samples for '{class_name}'...")
+    
+    if class_name == 'human_organic':
+        # Mix standard (60%) and fast (40%) profiles for robustness
+        n_standard = int(n_samples * 0.6)
+        n_fast = n_samples - n_standard
+        print(f"  - {n_standard} Standard Human")
+        print(f"  - {n_fast} Fast Human (Robustness)")
+        return generate_organic_human(n_standard, rng) + generate_fast_human(n_fast, rng)
+    
+    generators = {
+        'paste': generate_paste,
+        'ai_assisted': generate_ai_assisted,
+        'copy_paste_hybrid': generate_copy_paste_hybrid,
+        'human_nonnative': generate_nonnative,
+        'human_coding': generate_coding,
+    }
+    return generators[class_name](n_samples, rng)
 
 
 def generate_all_classes(
     samples_per_class: dict = None,
     output_dir: Path = None,
     seed: int = 42,
+    workers: Optional[int] = None,
+    output_format: str = 'parquet',
 ) -> pd.DataFrame:
-    """Generate synthetic data for all classes."""
+    """
+    Generate synthetic data for all classes.
+    
+    Classes are independent, so each one is generated in its own worker
+    process (``workers=1`` runs everything in-process). When output_dir is
+    given the dataset is written as zstd Parquet, or CSV with
+    ``output_format='csv'``.
+    """
     
     if samples_per_class is None:
         samples_per_class = {
@@ -514,37 +643,24 @@ def generate_all_classes(
             'human_coding': 3000,
         }
     
-    generators = {
-        'human_organic': generate_organic_human,
-        'paste': generate_paste,
-        'ai_assisted': generate_ai_assisted,
-        'copy_paste_hybrid': generate_copy_paste_hybrid,
-        'human_nonnative': generate_nonnative,
-        'human_coding': generate_coding,
-    }
+    # One independent, reproducible stream per class plus one for the final
+    # shuffle (str hash() is salted per process, so it can't be used to
+    # derive seeds)
+    *child_seeds, shuffle_seed = np.random.SeedSequence(seed).spawn(len(CLASSES) + 1)
+    class_seeds = dict(zip(CLASSES, child_seeds))
     
+    jobs = [(c, n, class_seeds[c]) for c, n in samples_per_class.items()]
     all_sessions = []
     
-    for class_name, n_samples in samples_per_class.items():
-        print(f"Generating {n_samples} samples for '{class_name}'...")
-        
-        if class_name == 'human_organic':
-            # Mix standard (60%) and fast (40%) profiles for robustness
-            n_standard = int(n_samples * 0.6)
-            n_fast = n_samples - n_standard
-            
-            print(f"  - {n_standard} Standard Human")
-            print(f"  - {n_fast} Fast Human (Robustness)")
-            
-            gen_standard = generators[class_name]
-            sessions_std = gen_standard(n_standard, seed=seed)
-            sessions_fast = generate_fast_human(n_fast, seed=seed + 1)
-            sessions = sessions_std + sessions_fast
-        else:
-            generator = generators[class_name]
-            sessions = generator(n_samples, seed=seed + hash(class_name) % 1000)
-            
-        all_sessions.extend(sessions)
+    if workers == 1:
+        for job in jobs:
+            all_sessions.extend(_generate_class(*job))
+    else:
+        with ProcessPoolExecutor(max_workers=workers or len(jobs)) as executor:
+            futures = [executor.submit(_generate_class, *job) for job in jobs]
+            # Collect in submission order so output is deterministic
+            for future in futures:
+                all_sessions.extend(future.result())
     
     print(f"\nTotal sessions generated: {len(all_sessions)}")
     
@@ -552,22 +668,30 @@ def generate_all_classes(
     df = sessions_to_dataframe(all_sessions)
     
     # Shuffle
-    df = df.sample(frac=1, random_state=seed).reset_index(drop=True)
+    df = df.sample(frac=1, random_state=np.random.default_rng(shuffle_seed)).reset_index(drop=True)
+    
+    # Category codes follow CLASSES order, so they equal label_id
+    df['label'] = pd.Categorical(df['label'], categories=CLASSES)
     
     # Save if output dir specified
     if output_dir:
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        csv_path = output_dir / 'synthetic_multiclass.csv'
-        df.to_csv(csv_path, index=False)
-        print(f"Saved to: {csv_path}")
+        if output_format == 'csv':
+            data_path = output_dir / 'synthetic_multiclass.csv'
+            df.to_csv(data_path, index=False)
+        else:
+            data_path = output_dir / 'synthetic_multiclass.parquet'
+            df.to_parquet(data_path, compression='zstd', index=False)
+        print(f"Saved to: {data_path}")
         
         # Save metadata
         meta = {
             'classes': CLASSES,
             'class_to_id': CLASS_TO_ID,
             'samples_per_class': samples_per_class,
+            'seed': seed,
             'total_samples': len(df),
             'features': list(df.columns),
         }
@@ -587,6 +711,10 @@ def main():
                         help='Random seed for reproducibility')
     parser.add_argument('--samples', type=int, default=None,
                         help='Override samples per class (equal distribution)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: one per class, 1 = in-process)')
+    parser.add_argument('--format', choices=['parquet', 'csv'], default='parquet',
+                        help='Output file format')
     args = parser.parse_args()
     
     print("=" * 50)
@@ -602,6 +730,8 @@ def main():
         samples_per_class=samples_per_class,
         output_dir=args.output_dir,
         seed=args.seed,
+        workers=args.workers,
+        output_format=args.format,
     )
     
     print("\n" + "=" * 50)
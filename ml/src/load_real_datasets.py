@@ -12,20 +12,39 @@ Usage:
 
 import argparse
 import os
+from concurrent.futures import ProcessPoolExecutor
 import zipfile
 import subprocess
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, List, Optional, Tuple
 import shutil
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+from generate_synthetic import CLASS_TO_ID, segment_reduce
 
 
 # Dataset URLs
 AALTO_URL = "http://userinterfaces.aalto.fi/136Mkeystrokes/data/Keystrokes.zip"
 LIVENESS_URL = "https://data.mendeley.com/public-files/datasets/mzm86rcxxd/files/84f96d4f-b8b9-4b64-9d82-7d93a1a87c45/file_downloaded"
 
+# Aalto participant file layout; only the session keys and timings are read
+AALTO_COLUMNS = [
+    'participant_id', 'test_section', 'sentence', 'user_input',
+    'keystroke_id', 'press_time', 'release_time', 'letter', 'keycode'
+]
+AALTO_USECOLS = ['test_section', 'sentence', 'press_time', 'release_time']
+AALTO_BLOCK_SIZE = 8 << 20  # Bytes per Arrow CSV block
+AALTO_BATCH_ROWS = 1_000_000  # Rows per batch from the converted Parquet files
+AALTO_PARQUET_DIR = "aalto_keystrokes"  # One Parquet file per participant
+
+# Timing columns used from the liveness CSVs (naming varies by source)
+LIVENESS_TIMING_COLUMNS = {'hold_time', 'flight_time', 'HT', 'FT'}
+
 
 def download_file(url: str, output_path: Path, description: str) -> bool:
     """Download file using wget or curl."""
@@ -70,7 +89,171 @@ def extract_zip(zip_path: Path, extract_to: Path) -> bool:
         return False
 
 
-def process_aalto_dataset(data_dir: Path, output_path: Path, max_users: int = 5000) -> pd.DataFrame:
+def _open_aalto_csv(path: Path) -> pa.RecordBatchReader:
+    """
+    Arrow streaming reader over an Aalto participant .txt file, decoding
+    blocks of AALTO_BLOCK_SIZE bytes and converting only AALTO_USECOLS.
+    """
+    return pacsv.open_csv(
+        path,
+        read_options=pacsv.ReadOptions(
+            column_names=AALTO_COLUMNS,
+            block_size=AALTO_BLOCK_SIZE,
+        ),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=AALTO_USECOLS,
+            column_types={
+                'test_section': pa.int32(),
+                'sentence': pa.string(),
+                'press_time': pa.int64(),
+                'release_time': pa.int64(),
+            },
+        ),
+    )
+
+
+def _iter_aalto_sections(path: Path) -> Iterator[pd.DataFrame]:
+    """
+    Stream an Aalto participant file as narrow frames of whole test sections.
+    
+    Reads either the raw .txt file or its converted .parquet copy (see
+    convert_aalto_to_parquet). Rows of the last section in a batch are
+    carried into the next one so that no session is split across frames.
+    """
+    if path.suffix == '.parquet':
+        reader = pq.ParquetFile(path).iter_batches(
+            batch_size=AALTO_BATCH_ROWS, columns=AALTO_USECOLS
+        )
+    else:
+        reader = _open_aalto_csv(path)
+    
+    carry = None
+    for batch in reader:
+        chunk = batch.to_pandas()
+        if carry is not None:
+            chunk = pd.concat([carry, chunk], ignore_index=True)
+        if not len(chunk):
+            continue
+        
+        sections = chunk['test_section'].to_numpy()
+        split = np.flatnonzero(sections != sections[-1])
+        split = split[-1] + 1 if len(split) else 0
+        
+        if split:
+            yield chunk.iloc[:split]
+        carry = chunk.iloc[split:]
+    
+    if carry is not None and len(carry):
+        yield carry
+
+
+def _process_one_aalto_file(path: Path) -> pd.DataFrame:
+    """
+    Extract one feature row per sentence session of a participant file.
+    
+    Each frame is processed as flat arrays: rows are stably sorted by
+    session so every session is a contiguous segment, and the features of
+    all sessions come from one extract_features_from_segments call instead
+    of a groupby loop with small per-session NumPy calls.
+    """
+    frames = []
+    
+    try:
+        for frame in _iter_aalto_sections(path):
+            # Calculate timing
+            press = frame['press_time'].to_numpy()
+            dwell = np.subtract(frame['release_time'].to_numpy(), press)
+            flight = np.empty_like(press)
+            flight[0] = 0
+            np.subtract(press[1:], press[:-1], out=flight[1:])
+            
+            # Group by sentence (session), keeping sessions of 10+ keys
+            # Sentences are factorized to int codes once, so grouping and
+            # session ids never hash the sentence strings per row
+            sections = frame['test_section'].to_numpy()
+            sentence_ids = pd.factorize(frame['sentence'], sort=False)[0].astype(np.int32)
+            group_key = sections.astype(np.int64) * (int(sentence_ids.max()) + 1) + sentence_ids
+            group_ids = pd.factorize(group_key, sort=False)[0]
+            order = np.argsort(group_ids, kind='stable')
+            lengths = np.bincount(group_ids)
+            starts = np.cumsum(lengths) - lengths
+            keep = lengths >= 10
+            if not keep.any():
+                continue
+            
+            row_keep = np.repeat(keep, lengths)
+            is_first = np.zeros(len(order), dtype=bool)
+            is_first[starts] = True
+            
+            dwells = dwell[order][row_keep]
+            flights = flight[order][row_keep & ~is_first]  # Skip first flight
+            
+            first_rows = order[starts[keep]]
+            session_ids = [
+                f"{path.stem}_{section}_{sentence_id}"
+                for section, sentence_id in zip(sections[first_rows], sentence_ids[first_rows])
+            ]
+            
+            frames.append(extract_features_from_segments(
+                dwells, lengths[keep],
+                flights, lengths[keep] - 1,
+                label='human_organic',
+                session_ids=session_ids,
+            ))
+            
+    except Exception as e:
+        # Keep the sessions read before the malformed rows
+        print(f"  Truncated {path.name}: {e}")
+    
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def convert_aalto_to_parquet(data_dir: Path, max_users: Optional[int] = None) -> Path:
+    """
+    One-time conversion of the raw Aalto .txt files to zstd Parquet.
+    
+    Each participant file becomes data_dir/AALTO_PARQUET_DIR/<stem>.parquet
+    holding only AALTO_USECOLS, so later runs of process_aalto_dataset read
+    typed columnar data instead of re-parsing CSV. Files already converted
+    are skipped, so an interrupted conversion can be resumed.
+    """
+    aalto_dir = data_dir / "Keystrokes"
+    parquet_dir = data_dir / AALTO_PARQUET_DIR
+    files = list(aalto_dir.glob("*.txt"))[:max_users]
+    
+    print(f"\nConverting {len(files)} Aalto files to Parquet...")
+    parquet_dir.mkdir(parents=True, exist_ok=True)
+    
+    for i, f in enumerate(files):
+        if i % 500 == 0:
+            print(f"  Converting user {i+1}/{len(files)}...")
+        
+        out_path = parquet_dir / f"{f.stem}.parquet"
+        if out_path.exists():
+            continue
+        
+        # Write to a temporary name so a failed file never looks converted
+        tmp_path = out_path.with_suffix('.parquet.tmp')
+        try:
+            reader = _open_aalto_csv(f)
+            with pq.ParquetWriter(tmp_path, reader.schema, compression='zstd') as writer:
+                for batch in reader:
+                    writer.write_batch(batch)
+            tmp_path.rename(out_path)
+        except Exception as e:
+            print(f"  Skipping {f.name}: {e}")
+            tmp_path.unlink(missing_ok=True)
+    
+    print(f"Converted to: {parquet_dir}")
+    return parquet_dir
+
+
+def process_aalto_dataset(
+    data_dir: Path,
+    output_path: Path,
+    max_users: int = 5000,
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
     """
     Process Aalto keystroke dataset.
     
@@ -80,53 +263,43 @@ def process_aalto_dataset(data_dir: Path, output_path: Path, max_users: int = 50
     """
     print(f"\nProcessing Aalto dataset (max {max_users} users)...")
     
+    # Prefer the one-time Parquet conversion over re-parsing the raw files
+    parquet_dir = data_dir / AALTO_PARQUET_DIR
     aalto_dir = data_dir / "Keystrokes"
-    if not aalto_dir.exists():
+    if parquet_dir.exists():
+        files = sorted(parquet_dir.glob("*.parquet"))[:max_users]
+    elif aalto_dir.exists():
+        files = list(aalto_dir.glob("*.txt"))[:max_users]
+    else:
         print(f"Aalto data not found at {aalto_dir}")
         return pd.DataFrame()
     
-    records = []
-    files = list(aalto_dir.glob("*.txt"))[:max_users]
+    frames = []
     
-    for i, f in enumerate(files):
-        if i % 500 == 0:
-            print(f"  Processing user {i+1}/{len(files)}...")
-        
-        try:
-            # Read user file
-            df = pd.read_csv(f, header=None, names=[
-                'participant_id', 'test_section', 'sentence', 'user_input',
-                'keystroke_id', 'press_time', 'release_time', 'letter', 'keycode'
-            ])
-            
-            # Calculate timing
-            df['dwell_time'] = df['release_time'] - df['press_time']
-            df['flight_time'] = df['press_time'].diff().fillna(0)
-            
-            # Group by sentence (session)
-            for (section, sentence), group in df.groupby(['test_section', 'sentence']):
-                dwells = group['dwell_time'].values
-                flights = group['flight_time'].values[1:]  # Skip first
-                
-                if len(dwells) < 10:
-                    continue
-                
-                # Extract features
-                record = extract_features_from_timing(
-                    dwells, flights, 
-                    label='human_organic',
-                    session_id=f"{f.stem}_{section}_{hash(sentence) % 10000}"
-                )
-                records.append(record)
-                
-        except Exception as e:
-            continue
+    # Participant files are independent, so they are spread over worker
+    # processes (workers=1 runs everything in-process)
+    if workers == 1:
+        results = map(_process_one_aalto_file, files)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+        results = executor.map(_process_one_aalto_file, files, chunksize=16)
     
-    df = pd.DataFrame(records)
+    try:
+        for i, file_df in enumerate(results):
+            if i % 500 == 0:
+                print(f"  Processing user {i+1}/{len(files)}...")
+            if len(file_df):
+                frames.append(file_df)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
     print(f"Processed {len(df)} sessions from Aalto dataset")
     
     if len(df) > 0:
-        df.to_csv(output_path, index=False)
+        save_table(df, output_path)
         print(f"Saved to: {output_path}")
     
     return df
@@ -150,7 +323,8 @@ def process_liveness_dataset(data_dir: Path, output_path: Path) -> pd.DataFrame:
     # Find all CSV files
     for csv_file in liveness_dir.rglob("*.csv"):
         try:
-            df = pd.read_csv(csv_file)
+            # Only the timing columns; some sources carry wide metadata
+            df = pd.read_csv(csv_file, usecols=lambda c: c in LIVENESS_TIMING_COLUMNS)
             
             # Determine if human or synthetic based on path/filename
             is_human = 'human' in str(csv_file).lower() or 'genuine' in str(csv_file).lower()
@@ -158,11 +332,16 @@ def process_liveness_dataset(data_dir: Path, output_path: Path) -> pd.DataFrame:
             
             # Process timing columns (format varies by source dataset)
             if 'hold_time' in df.columns and 'flight_time' in df.columns:
-                dwells = df['hold_time'].values
-                flights = df['flight_time'].values
+                dwells = df['hold_time'].to_numpy()
+                flights = df['flight_time'].to_numpy()
             elif 'HT' in df.columns:  # Holdtime
-                dwells = df['HT'].values
-                flights = df.get('FT', df.get('flight_time', np.zeros(len(df)))).values
+                dwells = df['HT'].to_numpy()
+                if 'FT' in df.columns:
+                    flights = df['FT'].to_numpy()
+                elif 'flight_time' in df.columns:
+                    flights = df['flight_time'].to_numpy()
+                else:
+                    continue
             else:
                 continue
             
@@ -187,12 +366,27 @@ def process_liveness_dataset(data_dir: Path, output_path: Path) -> pd.DataFrame:
     print(f"Processed {len(df)} sessions from Liveness dataset")
     
     if len(df) > 0:
-        df.to_csv(output_path, index=False)
+        save_table(df, output_path)
         print(f"Saved to: {output_path}")
     
     return df
 
 
+def _moments(values: np.ndarray) -> Tuple[float, float, float]:
+    """
+    Sum, mean and population std of a non-empty array.
+    
+    Uses one sum and one dot product instead of separate np.mean/np.std
+    passes (np.std alone makes two passes plus a temporary).
+    """
+    values = values.astype(np.float64, copy=False)
+    n = len(values)
+    total = float(values.sum())
+    mean = total / n
+    var = float(np.dot(values, values)) / n - mean * mean
+    return total, mean, float(np.sqrt(max(var, 0.0)))
+
+
 def extract_features_from_timing(
     dwells: np.ndarray,
     flights: np.ndarray,
@@ -201,8 +395,6 @@ def extract_features_from_timing(
 ) -> dict:
     """Extract features matching synthetic data format."""
     
-    from generate_synthetic import CLASS_TO_ID
-    
     # Filter valid values
     dwells = dwells[(dwells > 0) & (dwells < 2000)]
     flights = flights[(flights > -500) & (flights < 5000)]
@@ -212,38 +404,157 @@ def extract_features_from_timing(
     if len(flights) == 0:
         flights = np.array([80.0])
     
+    dwell_sum, dwell_mean, dwell_std = _moments(dwells)
+    flight_sum, flight_mean, flight_std = _moments(flights)
+    
     # Pause detection
     pause_threshold = 500
-    pauses = flights[flights > pause_threshold]
+    is_pause = flights > pause_threshold
+    n_pauses = int(np.count_nonzero(is_pause))
+    pause_sum = float(np.dot(flights, is_pause))
     
     return {
         'session_id': session_id,
         'label': label,
         'label_id': CLASS_TO_ID.get(label, 0),
         'total_keystrokes': len(dwells),
-        'duration_ms': float(np.sum(dwells) + np.sum(flights)),
-        'avg_dwell_time': float(np.mean(dwells)),
-        'std_dwell_time': float(np.std(dwells)),
-        'min_dwell_time': float(np.min(dwells)),
-        'max_dwell_time': float(np.max(dwells)),
-        'avg_flight_time': float(np.mean(flights)),
-        'std_flight_time': float(np.std(flights)),
-        'min_flight_time': float(np.min(flights)),
-        'max_flight_time': float(np.max(flights)),
+        'duration_ms': dwell_sum + flight_sum,
+        'avg_dwell_time': dwell_mean,
+        'std_dwell_time': dwell_std,
+        'min_dwell_time': float(dwells.min()),
+        'max_dwell_time': float(dwells.max()),
+        'avg_flight_time': flight_mean,
+        'std_flight_time': flight_std,
+        'min_flight_time': float(flights.min()),
+        'max_flight_time': float(flights.max()),
         'zero_dwell_ratio': 0.0,
         'zero_flight_ratio': 0.0,
-        'pause_count': len(pauses),
-        'pause_ratio': len(pauses) / max(len(flights), 1),
+        'pause_count': n_pauses,
+        'pause_ratio': n_pauses / max(len(flights), 1),
         'backspace_ratio': 0.0,  # Not available in timing-only data
         'tab_ratio': 0.0,
         'ctrl_ratio': 0.0,
         'symbol_ratio': 0.0,
-        'long_pause_count': len(pauses),
-        'avg_long_pause': float(np.mean(pauses)) if len(pauses) > 0 else 0.0,
+        'long_pause_count': n_pauses,
+        'avg_long_pause': pause_sum / n_pauses if n_pauses > 0 else 0.0,
         'burst_count': 0,
     }
 
 
+def _filtered_segment_stats(
+    values: np.ndarray,
+    lengths: np.ndarray,
+    valid: np.ndarray,
+    fill: float,
+) -> Tuple[np.ndarray, ...]:
+    """
+    Per-segment count, sum, mean, std, min and max over the valid entries.
+    
+    Segments left with no valid entries are treated as the single value
+    fill, matching the fallback in extract_features_from_timing.
+    """
+    segment = np.repeat(np.arange(len(lengths)), lengths)
+    values = values[valid].astype(np.float64, copy=False)
+    lengths = np.bincount(segment[valid], minlength=len(lengths))
+    
+    empty = lengths == 0
+    counts = np.where(empty, 1, lengths)
+    total = segment_reduce(np.add, values, lengths)
+    total[empty] = fill
+    mean = total / counts
+    sq = segment_reduce(np.add, values * values, lengths)
+    sq[empty] = fill * fill
+    std = np.sqrt(np.maximum(sq / counts - mean * mean, 0.0))
+    mins = np.where(empty, fill, segment_reduce(np.minimum, values, lengths))
+    maxs = np.where(empty, fill, segment_reduce(np.maximum, values, lengths))
+    
+    return counts, total, mean, std, mins, maxs
+
+
+def extract_features_from_segments(
+    dwells: np.ndarray,
+    dwell_len: np.ndarray,
+    flights: np.ndarray,
+    flight_len: np.ndarray,
+    label: str,
+    session_ids: List[str],
+) -> pd.DataFrame:
+    """
+    Batched extract_features_from_timing.
+    
+    Session i owns the next dwell_len[i] dwells and flight_len[i] flights
+    of the flat arrays (CSR-style), so every feature is a reduceat over
+    all sessions at once. Returns one row per session.
+    """
+    n = len(session_ids)
+    
+    # Filter valid values (empty sessions fall back to 100ms / 80ms)
+    dwell_valid = (dwells > 0) & (dwells < 2000)
+    flight_valid = (flights > -500) & (flights < 5000)
+    
+    dwell_n, dwell_sum, dwell_mean, dwell_std, dwell_min, dwell_max = _filtered_segment_stats(
+        dwells, dwell_len, dwell_valid, 100.0
+    )
+    flight_n, flight_sum, flight_mean, flight_std, flight_min, flight_max = _filtered_segment_stats(
+        flights, flight_len, flight_valid, 80.0
+    )
+    
+    # Pause detection (the 80ms fallback is never a pause)
+    pause_threshold = 500
+    is_pause = flight_valid & (flights > pause_threshold)
+    pause_seg = np.repeat(np.arange(n), flight_len)[is_pause]
+    n_pauses = np.bincount(pause_seg, minlength=n)
+    pause_sum = np.bincount(pause_seg, weights=flights[is_pause], minlength=n)
+    
+    zeros = np.zeros(n)
+    return pd.DataFrame({
+        'session_id': session_ids,
+        'label': label,
+        'label_id': CLASS_TO_ID.get(label, 0),
+        'total_keystrokes': dwell_n,
+        'duration_ms': dwell_sum + flight_sum,
+        'avg_dwell_time': dwell_mean,
+        'std_dwell_time': dwell_std,
+        'min_dwell_time': dwell_min,
+        'max_dwell_time': dwell_max,
+        'avg_flight_time': flight_mean,
+        'std_flight_time': flight_std,
+        'min_flight_time': flight_min,
+        'max_flight_time': flight_max,
+        'zero_dwell_ratio': zeros,
+        'zero_flight_ratio': zeros,
+        'pause_count': n_pauses,
+        'pause_ratio': n_pauses / flight_n,
+        'backspace_ratio': zeros,  # Not available in timing-only data
+        'tab_ratio': zeros,
+        'ctrl_ratio': zeros,
+        'symbol_ratio': zeros,
+        'long_pause_count': n_pauses,
+        'avg_long_pause': pause_sum / np.maximum(n_pauses, 1),
+        'burst_count': 0,
+    })
+
+
+def save_table(df: pd.DataFrame, path: Path) -> None:
+    """Write a dataset as zstd Parquet, or CSV when path ends in .csv."""
+    if path.suffix == '.csv':
+        df.to_csv(path, index=False)
+    else:
+        df.to_parquet(path, compression='zstd', index=False)
+
+
+def load_table(path: Path) -> Optional[pd.DataFrame]:
+    """
+    Read a Parquet dataset, falling back to a CSV of the same name written
+    by older versions. Returns None if neither exists.
+    """
+    if path.exists():
+        return pd.read_parquet(path)
+    if path.with_suffix('.csv').exists():
+        return pd.read_csv(path.with_suffix('.csv'))
+    return None
+
+
 def merge_datasets(data_dir: Path, output_path: Path) -> pd.DataFrame:
     """Merge synthetic and real datasets."""
     print("\n" + "=" * 50)
@@ -252,39 +563,32 @@ def merge_datasets(data_dir: Path, output_path: Path) -> pd.DataFrame:
     
     dfs = []
     
-    # Load synthetic
-    synthetic_path = data_dir / "synthetic_multiclass.csv"
-    if synthetic_path.exists():
-        df = pd.read_csv(synthetic_path)
-        print(f"  Synthetic: {len(df)} samples")
-        dfs.append(df)
-    
-    # Load Aalto
-    aalto_path = data_dir / "aalto_processed.csv"
-    if aalto_path.exists():
-        df = pd.read_csv(aalto_path)
-        print(f"  Aalto: {len(df)} samples")
-        dfs.append(df)
-    
-    # Load Liveness
-    liveness_path = data_dir / "liveness_processed.csv"
-    if liveness_path.exists():
-        df = pd.read_csv(liveness_path)
-        print(f"  Liveness: {len(df)} samples")
-        dfs.append(df)
+    sources = [
+        ('Synthetic', data_dir / "synthetic_multiclass.parquet"),
+        ('Aalto', data_dir / "aalto_processed.parquet"),
+        ('Liveness', data_dir / "liveness_processed.parquet"),
+    ]
+    for name, path in sources:
+        df = load_table(path)
+        if df is not None:
+            print(f"  {name}: {len(df)} samples")
+            dfs.append(df)
     
     if not dfs:
         print("No datasets found!")
         return pd.DataFrame()
     
     combined = pd.concat(dfs, ignore_index=True)
-    combined = combined.sample(frac=1, random_state=42).reset_index(drop=True)
+    # Synthetic ids are ints, real ones strings; Parquet needs one type
+    combined['session_id'] = combined['session_id'].astype(str)
+    # Left unshuffled: a full-frame sample() copies every column, and
+    # train_multiclass.py's train_test_split shuffles rows anyway
     
     print(f"\nTotal combined: {len(combined)} samples")
     print("\nClass distribution:")
     print(combined['label'].value_counts())
     
-    combined.to_csv(output_path, index=False)
+    save_table(combined, output_path)
     print(f"\nSaved to: {output_path}")
     
     return combined
@@ -302,6 +606,10 @@ def main():
                         help='Only process already-downloaded data')
     parser.add_argument('--max-users', type=int, default=5000,
                         help='Max users to process from Aalto')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for Aalto (default: CPU count, 1 = in-process)')
+    parser.add_argument('--convert-aalto-to-parquet', action='store_true',
+                        help='Convert raw Aalto files to Parquet once for faster reprocessing')
     parser.add_argument('--merge', action='store_true',
                         help='Merge all datasets into combined file')
     args = parser.parse_args()
@@ -333,25 +641,28 @@ def main():
             print(f"Liveness already downloaded: {liveness_zip}")
     
     # Process datasets
-    aalto_out = args.data_dir / "aalto_processed.csv"
-    liveness_out = args.data_dir / "liveness_processed.csv"
+    aalto_out = args.data_dir / "aalto_processed.parquet"
+    liveness_out = args.data_dir / "liveness_processed.parquet"
+    
+    if args.convert_aalto_to_parquet and (args.data_dir / "Keystrokes").exists():
+        convert_aalto_to_parquet(args.data_dir, args.max_users)
     
-    if (args.data_dir / "Keystrokes").exists():
-        process_aalto_dataset(args.data_dir, aalto_out, args.max_users)
+    if (args.data_dir / "Keystrokes").exists() or (args.data_dir / AALTO_PARQUET_DIR).exists():
+        process_aalto_dataset(args.data_dir, aalto_out, args.max_users, args.workers)
     
     if (args.data_dir / "liveness").exists():
         process_liveness_dataset(args.data_dir, liveness_out)
     
     # Merge
     if args.merge:
-        combined_out = args.data_dir / "combined_multiclass.csv"
+        combined_out = args.data_dir / "combined_multiclass.parquet"
         merge_datasets(args.data_dir, combined_out)
     
     print("\n" + "=" * 50)
     print("Done!")
     print("=" * 50)
     print("\nNext steps:")
-    print("  1. If you downloaded data, run: python train_multiclass.py --data data/combined_multiclass.csv")
+    print("  1. If you downloaded data, run: python train_multiclass.py --data data/combined_multiclass.parquet")
     print("  2. Or merge datasets: python load_real_datasets.py --merge")
 
 
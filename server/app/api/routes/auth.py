@@ -1,17 +1,26 @@
 """Authentication API routes."""
 
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Optional
+from typing import NamedTuple, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status, Depends, Header
+import asyncpg
+from fastapi import APIRouter, HTTPException, status, Depends, Header, Response
 from pydantic import BaseModel, EmailStr, Field
 
-from app.db import get_pool
+from app.config import get_settings
+from app.db import get_pool, db_connection
 from app.services.auth_service import auth_service, TokenPair
 
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 # ==================== REQUEST/RESPONSE MODELS ====================
@@ -51,10 +60,115 @@ class AuthResponse(BaseModel):
 
 # ==================== HELPER FUNCTIONS ====================
 
+class _CachedUser(NamedTuple):
+    """A verified access token's user, plus its /me body once rendered."""
+    expires_at: float  # Epoch seconds
+    user: UserResponse
+    json: Optional[bytes] = None
+
+
+# Verified access tokens, LRU-ordered. Keyed by SHA-256 of the token so
+# raw tokens are never held in memory.
+_user_cache: OrderedDict[bytes, _CachedUser] = OrderedDict()
+
+
+def _token_cache_key(token: str) -> bytes:
+    """Cache key for an access token."""
+    return hashlib.sha256(token.encode()).digest()
+
+
+def _get_cached_user(key: bytes) -> Optional[_CachedUser]:
+    """Return the cache entry for a token if it is still fresh."""
+    entry = _user_cache.get(key)
+    if entry is None:
+        return None
+    
+    if entry.expires_at <= time.time():
+        del _user_cache[key]
+        return None
+    
+    _user_cache.move_to_end(key)
+    return entry
+
+
+def _cache_user(key: bytes, user: UserResponse, token_exp: datetime) -> None:
+    """Cache a verified user until the TTL or the token's own expiry."""
+    expires_at = min(token_exp.timestamp(), time.time() + settings.auth_cache_ttl_seconds)
+    _user_cache[key] = _CachedUser(expires_at, user)
+    _user_cache.move_to_end(key)
+    
+    while len(_user_cache) > settings.auth_cache_max_size:
+        _user_cache.popitem(last=False)
+
+
+# Strong references to in-flight background rehashes so they aren't
+# garbage-collected before finishing.
+_rehash_tasks: set[asyncio.Task] = set()
+
+
+async def _rehash_password(user_id: UUID, password: str, old_hash: str) -> None:
+    """Re-hash a password at the current bcrypt cost and store it."""
+    try:
+        new_hash = await auth_service.hash_password_async(password)
+        pool = get_pool()
+        async with pool.acquire() as conn:
+            # Only replace the hash we verified against, in case the
+            # password changed meanwhile
+            await conn.execute(
+                "UPDATE users SET password_hash = $1 WHERE id = $2 AND password_hash = $3",
+                new_hash,
+                user_id,
+                old_hash
+            )
+    except Exception:
+        logger.exception("Password rehash failed for user %s", user_id)
+
+
+# In-flight user lookups by user id (the token subject)
+_user_lookups: dict[str, asyncio.Task] = {}
+
+
+async def _fetch_active_user(user_id: str) -> Optional[UserResponse]:
+    """Load an active user, or None if missing or deactivated."""
+    # asyncpg encodes the id string as a uuid itself, so there's no need
+    # to build a UUID object first
+    pool = get_pool()
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow(
+            """
+            SELECT id, email, display_name, is_verified, created_at
+            FROM users WHERE id = $1 AND is_active = TRUE
+            """,
+            user_id
+        )
+    
+    if not row:
+        return None
+    
+    # Trusted DB row; the schema already enforces these types
+    return UserResponse.model_construct(
+        id=row["id"],
+        email=row["email"],
+        display_name=row["display_name"],
+        is_verified=row["is_verified"],
+        created_at=row["created_at"],
+    )
+
+
+def _bearer_token(authorization: str) -> Optional[str]:
+    """Token from a "Bearer <token>" header, or None if malformed."""
+    if authorization[:7].lower() != "bearer ":
+        return None
+    token = authorization[7:].strip()
+    if not token or " " in token:
+        return None
+    return token
+
+
 async def get_current_user(authorization: Optional[str] = Header(None)) -> UserResponse:
     """Get current authenticated user from JWT token."""
     if not authorization:
-        print("[DEBUG] No Authorization header")
+        logger.debug("No Authorization header")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Missing authorization header",
@@ -62,15 +176,20 @@ async def get_current_user(authorization: Optional[str] = Header(None)) -> UserR
         )
     
     # Extract token from "Bearer <token>"
-    parts = authorization.split()
-    if len(parts) != 2 or parts[0].lower() != "bearer":
+    token = _bearer_token(authorization)
+    if token is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authorization header format",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    token = parts[1]
+    # Recently verified tokens skip JWT verification and the user lookup
+    cache_key = _token_cache_key(token)
+    cached = _get_cached_user(cache_key)
+    if cached is not None:
+        return cached.user
+    
     payload = auth_service.verify_access_token(token)
     
     if not payload:
@@ -80,30 +199,23 @@ async def get_current_user(authorization: Optional[str] = Header(None)) -> UserR
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Fetch user from database
-    pool = await get_pool()
-    async with pool.acquire() as conn:
-        row = await conn.fetchrow(
-            """
-            SELECT id, email, display_name, is_verified, created_at
-            FROM users WHERE id = $1 AND is_active = TRUE
-            """,
-            UUID(payload.sub)
-        )
-        
-        if not row:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found or inactive",
-            )
-        
-        return UserResponse(
-            id=row["id"],
-            email=row["email"],
-            display_name=row["display_name"],
-            is_verified=row["is_verified"],
-            created_at=row["created_at"],
+    # Concurrent requests for the same user share one database lookup
+    lookup = _user_lookups.get(payload.sub)
+    if lookup is None:
+        lookup = asyncio.create_task(_fetch_active_user(payload.sub))
+        _user_lookups[payload.sub] = lookup
+        lookup.add_done_callback(lambda _: _user_lookups.pop(payload.sub, None))
+    
+    # Shielded so one cancelled request doesn't fail the others waiting on it
+    user = await asyncio.shield(lookup)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found or inactive",
         )
+    
+    _cache_user(cache_key, user, payload.exp)
+    return user
 
 
 async def get_current_user_optional(
@@ -115,10 +227,10 @@ async def get_current_user_optional(
     
     try:
         user = await get_current_user(authorization)
-        print(f"[DEBUG] Optional Auth Success: {user.email}")
+        logger.debug("Optional auth success: %s", user.email)
         return user
     except HTTPException:
-        print("[DEBUG] Optional Auth: Token invalid/expired, treating as Guest")
+        logger.debug("Optional auth: token invalid/expired, treating as guest")
         return None
 
 
@@ -127,29 +239,19 @@ async def get_current_user_optional(
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
 async def register(request: RegisterRequest) -> AuthResponse:
     """Register a new user account."""
-    pool = await get_pool()
+    # Hash password (bcrypt is CPU-bound; keep it off the event loop and
+    # don't hold a pooled connection while it runs)
+    password_hash = await auth_service.hash_password_async(request.password)
+    
+    pool = get_pool()
     
     async with pool.acquire() as conn:
-        # Check if email already exists
-        existing = await conn.fetchrow(
-            "SELECT id FROM users WHERE email = $1",
-            request.email
-        )
-        
-        if existing:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Email already registered",
-            )
-        
-        # Hash password
-        password_hash = auth_service.hash_password(request.password)
-        
-        # Create user
+        # Create user; an existing email (or its external_id) yields no row
         row = await conn.fetchrow(
             """
             INSERT INTO users (email, password_hash, display_name, external_id)
             VALUES ($1, $2, $3, $4)
+            ON CONFLICT DO NOTHING
             RETURNING id, email, display_name, is_verified, created_at
             """,
             request.email,
@@ -158,7 +260,13 @@ async def register(request: RegisterRequest) -> AuthResponse:
             f"email:{request.email}"  # external_id for compatibility
         )
         
-        user = UserResponse(
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Email already registered",
+            )
+        
+        user = UserResponse.model_construct(
             id=row["id"],
             email=row["email"],
             display_name=row["display_name"],
@@ -184,155 +292,185 @@ async def register(request: RegisterRequest) -> AuthResponse:
 
 
 @router.post("/login", response_model=AuthResponse)
-async def login(request: LoginRequest) -> AuthResponse:
+async def login(
+    request: LoginRequest,
+    conn: asyncpg.Connection = Depends(db_connection),
+) -> AuthResponse:
     """Login with email and password."""
-    pool = await get_pool()
+    # Fetch user
+    row = await conn.fetchrow(
+        """
+        SELECT id, email, password_hash, display_name, is_verified, is_active, created_at
+        FROM users WHERE email = $1
+        """,
+        request.email
+    )
     
-    async with pool.acquire() as conn:
-        # Fetch user
-        row = await conn.fetchrow(
-            """
-            SELECT id, email, password_hash, display_name, is_verified, is_active, created_at
-            FROM users WHERE email = $1
-            """,
-            request.email
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password",
         )
-        
-        if not row:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid email or password",
-            )
-        
-        if not row["is_active"]:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Account is deactivated",
-            )
-        
-        # Verify password
-        if not row["password_hash"] or not auth_service.verify_password(request.password, row["password_hash"]):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid email or password",
-            )
-        
-        user = UserResponse(
-            id=row["id"],
-            email=row["email"],
-            display_name=row["display_name"],
-            is_verified=row["is_verified"],
-            created_at=row["created_at"],
+    
+    if not row["is_active"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Account is deactivated",
         )
-        
-        # Update last login
-        await conn.execute(
-            "UPDATE users SET last_login_at = $1 WHERE id = $2",
-            datetime.now(timezone.utc),
-            user.id
+    
+    # Verify password (bcrypt is CPU-bound; keep it off the event loop)
+    if not row["password_hash"] or not await auth_service.verify_password_async(
+        request.password, row["password_hash"]
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password",
         )
-        
-        # Generate tokens
-        token_pair, token_hash, expires_at = auth_service.create_token_pair(user.id)
-        
-        # Store refresh token
-        await conn.execute(
-            """
-            INSERT INTO refresh_tokens (user_id, token_hash, expires_at)
-            VALUES ($1, $2, $3)
-            """,
-            user.id,
-            token_hash,
-            expires_at
+    
+    # Migrate hashes made at an outdated cost without delaying the response
+    if auth_service.password_needs_rehash(row["password_hash"]):
+        task = asyncio.create_task(
+            _rehash_password(row["id"], request.password, row["password_hash"])
         )
-        
-        return AuthResponse(user=user, tokens=token_pair)
+        _rehash_tasks.add(task)
+        task.add_done_callback(_rehash_tasks.discard)
+    
+    user = UserResponse.model_construct(
+        id=row["id"],
+        email=row["email"],
+        display_name=row["display_name"],
+        is_verified=row["is_verified"],
+        created_at=row["created_at"],
+    )
+    
+    # Generate tokens
+    token_pair, token_hash, expires_at = auth_service.create_token_pair(user.id)
+    
+    # Update last login and store the refresh token in one round trip
+    await conn.execute(
+        """
+        WITH upd AS (
+            UPDATE users SET last_login_at = $1 WHERE id = $2
+            RETURNING id
+        )
+        INSERT INTO refresh_tokens (user_id, token_hash, expires_at)
+        SELECT id, $3, $4 FROM upd
+        """,
+        datetime.now(timezone.utc),
+        user.id,
+        token_hash,
+        expires_at
+    )
+    
+    return AuthResponse(user=user, tokens=token_pair)
 
 
 @router.post("/refresh", response_model=TokenPair)
-async def refresh_token(request: RefreshRequest) -> TokenPair:
+async def refresh_token(
+    request: RefreshRequest,
+    conn: asyncpg.Connection = Depends(db_connection),
+) -> TokenPair:
     """Refresh access token using refresh token."""
-    pool = await get_pool()
-    
     # Hash the provided token
     token_hash = auth_service.hash_token(request.refresh_token)
+    new_refresh_token, new_token_hash, expires_at = auth_service.create_refresh_token()
     
-    async with pool.acquire() as conn:
-        # Find valid refresh token
-        row = await conn.fetchrow(
-            """
+    # Validate, revoke (rotation) and replace the refresh token in one
+    # statement. The old token is only revoked for active users, and
+    # revoked_at is rechecked so concurrent refreshes rotate only once.
+    row = await conn.fetchrow(
+        """
+        WITH presented AS (
             SELECT rt.id, rt.user_id, u.is_active
             FROM refresh_tokens rt
             JOIN users u ON u.id = rt.user_id
             WHERE rt.token_hash = $1
               AND rt.expires_at > NOW()
               AND rt.revoked_at IS NULL
-            """,
-            token_hash
+        ),
+        revoked AS (
+            UPDATE refresh_tokens SET revoked_at = NOW()
+            WHERE id IN (SELECT id FROM presented WHERE is_active)
+              AND revoked_at IS NULL
+            RETURNING user_id
+        ),
+        inserted AS (
+            INSERT INTO refresh_tokens (user_id, token_hash, expires_at)
+            SELECT user_id, $2, $3 FROM revoked
+            RETURNING user_id
         )
-        
-        if not row:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired refresh token",
-            )
-        
-        if not row["is_active"]:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Account is deactivated",
-            )
-        
-        user_id = row["user_id"]
-        old_token_id = row["id"]
-        
-        # Revoke old refresh token (rotation)
-        await conn.execute(
-            "UPDATE refresh_tokens SET revoked_at = NOW() WHERE id = $1",
-            old_token_id
+        SELECT presented.user_id, presented.is_active,
+               EXISTS (SELECT 1 FROM inserted) AS rotated
+        FROM presented
+        """,
+        token_hash,
+        new_token_hash,
+        expires_at
+    )
+    
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
         )
-        
-        # Generate new token pair
-        token_pair, new_token_hash, expires_at = auth_service.create_token_pair(user_id)
-        
-        # Store new refresh token
-        await conn.execute(
-            """
-            INSERT INTO refresh_tokens (user_id, token_hash, expires_at)
-            VALUES ($1, $2, $3)
-            """,
-            user_id,
-            new_token_hash,
-            expires_at
+    
+    if not row["is_active"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Account is deactivated",
         )
-        
-        return token_pair
+    
+    if not row["rotated"]:
+        # Lost a race with a concurrent refresh of the same token
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+        )
+    
+    return auth_service.complete_token_pair(row["user_id"], new_refresh_token)
 
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
 async def logout(
     request: RefreshRequest,
-    current_user: UserResponse = Depends(get_current_user)
+    current_user: UserResponse = Depends(get_current_user),
+    authorization: Optional[str] = Header(None),
+    conn: asyncpg.Connection = Depends(db_connection),
 ) -> None:
     """Logout and revoke refresh token."""
-    pool = await get_pool()
+    # Drop the cached verification of this access token
+    if authorization:
+        _user_cache.pop(_token_cache_key(_bearer_token(authorization)), None)
     
     token_hash = auth_service.hash_token(request.refresh_token)
     
-    async with pool.acquire() as conn:
-        # Revoke the refresh token
-        result = await conn.execute(
-            """
-            UPDATE refresh_tokens 
-            SET revoked_at = NOW() 
-            WHERE token_hash = $1 AND user_id = $2 AND revoked_at IS NULL
-            """,
-            token_hash,
-            current_user.id
-        )
+    # Revoke the refresh token
+    result = await conn.execute(
+        """
+        UPDATE refresh_tokens 
+        SET revoked_at = NOW() 
+        WHERE token_hash = $1 AND user_id = $2 AND revoked_at IS NULL
+        """,
+        token_hash,
+        current_user.id
+    )
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(current_user: UserResponse = Depends(get_current_user)) -> UserResponse:
+async def get_me(
+    current_user: UserResponse = Depends(get_current_user),
+    authorization: Optional[str] = Header(None),
+) -> UserResponse | Response:
     """Get current authenticated user."""
-    return current_user
+    # get_current_user has just cached this token; serve the rendered JSON
+    # from the same entry so repeat calls skip response-model serialization
+    key = _token_cache_key(_bearer_token(authorization))
+    cached = _get_cached_user(key)
+    if cached is None:
+        return current_user
+    
+    if cached.json is None:
+        cached = cached._replace(json=cached.user.model_dump_json().encode())
+        _user_cache[key] = cached
+    
+    return Response(content=cached.json, media_type="application/json")
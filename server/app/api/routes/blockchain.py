@@ -1,5 +1,7 @@
 """Blockchain API routes."""
 
+import asyncio
+
 from fastapi import APIRouter, HTTPException, status, Depends
 from pydantic import BaseModel
 from typing import Optional
@@ -38,7 +40,11 @@ async def anchor_session(
     # In a real app, we would verify the session exists and belongs to the user first.
     # We would also verify the session_hash matches the DB.
     
-    result = blockchain_service.anchor_session(request.session_hash, request.session_id)
+    # Web3 RPC calls and signing block (up to the 10s receipt wait), so run
+    # them in a worker thread instead of on the event loop
+    result = await asyncio.to_thread(
+        blockchain_service.anchor_session, request.session_hash, request.session_id
+    )
     
     if "error" in result:
         raise HTTPException(
@@ -58,4 +64,4 @@ async def anchor_session(
 @router.get("/verify/{tx_hash}")
 async def verify_anchor(tx_hash: str):
     """Verify a blockchain anchor transaction."""
-    return blockchain_service.verify_anchor(tx_hash)
+    return await asyncio.to_thread(blockchain_service.verify_anchor, tx_hash)
@@ -1,27 +1,44 @@
 """Verification API routes."""
 
+import asyncio
+import heapq
+import logging
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import Any
 from uuid import UUID
 
+import numpy as np
 from fastapi import APIRouter, HTTPException, status
-from pydantic import BaseModel
-
-from app.services import feature_extractor, keystroke_service, ml_inference
+from pydantic import BaseModel, ConfigDict
+
+from app.services import (
+    KeystrokeColumns,
+    feature_extractor,
+    keystroke_service,
+    ml_inference,
+)
 from app.services.content_analyzer import content_analyzer
 
 router = APIRouter(prefix="/verify", tags=["verification"])
+logger = logging.getLogger(__name__)
+
+_UTC = timezone.utc
 
 
 class VerificationRequest(BaseModel):
     """Request to verify a session."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     session_id: UUID
 
 
 class ContentAnalysisRequest(BaseModel):
     """Request to analyze text content."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     text: str
     session_id: UUID | None = None
 
@@ -29,6 +46,8 @@ class ContentAnalysisRequest(BaseModel):
 class ContentAnalysisResult(BaseModel):
     """Content analysis result response."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     is_human: bool
     confidence: float
     human_score: float
@@ -39,6 +58,8 @@ class ContentAnalysisResult(BaseModel):
 class CombinedVerificationRequest(BaseModel):
     """Request for combined keystroke + content verification."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     session_id: UUID
     text_content: str
     paste_count: int = 0
@@ -48,10 +69,12 @@ class CombinedVerificationRequest(BaseModel):
 class VerificationResult(BaseModel):
     """Verification result response."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     session_id: UUID
     is_human: bool
     confidence_score: float
-    features_summary: dict[str, float]
+    features_summary: dict[str, Any]
     computed_at: datetime
     feedback: str | None = None
 
@@ -59,6 +82,8 @@ class VerificationResult(BaseModel):
 class CombinedVerificationResult(BaseModel):
     """Combined verification result with both keystroke and content analysis."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     session_id: UUID
     is_human: bool
     confidence_score: float
@@ -69,77 +94,125 @@ class CombinedVerificationResult(BaseModel):
     computed_at: datetime
 
 
+# Outcomes of the verify_session decision ladder, in priority order
+(
+    _VERDICT_PASTE,
+    _VERDICT_AI,
+    _VERDICT_BURST,
+    _VERDICT_ML,
+    _VERDICT_WARNINGS,
+    _VERDICT_HUMAN,
+) = range(6)
+
+# Signal bits the ladder depends on
+_SIG_VOLUME = 1  # volume_high
+_SIG_PASTE_GT_AI = 2  # more pasted than AI-inserted volume
+_SIG_BURST = 4  # burst_detected
+_SIG_ML = 8  # ml_non_human
+_SIG_SUSPICIOUS = 16  # at least one *_suspicious signal
+_SIG_SUSPICIOUS_2 = 32  # at least two *_suspicious signals
+_SIG_ML_CONFIDENT = 64  # ML confidence above 0.75
+
+
+def _ladder_verdict(mask: int) -> int:
+    """Decision ladder outcome for one combination of signal bits."""
+    num_strong = sum(bool(mask & bit) for bit in (_SIG_VOLUME, _SIG_BURST, _SIG_ML))
+    suspicious = bool(mask & _SIG_SUSPICIOUS)
+
+    if mask & _SIG_VOLUME:
+        return _VERDICT_PASTE if mask & _SIG_PASTE_GT_AI else _VERDICT_AI
+    if mask & _SIG_BURST and (num_strong >= 2 or suspicious):
+        return _VERDICT_BURST
+    if mask & _SIG_ML and (
+        num_strong >= 2 or (suspicious and mask & _SIG_ML_CONFIDENT)
+    ):
+        return _VERDICT_ML
+    if num_strong == 1 or mask & _SIG_SUSPICIOUS_2:
+        return _VERDICT_WARNINGS
+    return _VERDICT_HUMAN
+
+
+# Every signal combination resolved once at import; verify_session indexes
+# it instead of re-walking the ladder's conditions per request
+_VERDICT_LUT = [_ladder_verdict(mask) for mask in range(128)]
+
+
+# Latest verification result per session, LRU-ordered, tagged with the
+# (keystroke count, last sequence number) it was computed from. Keystrokes
+# are append-only, so a matching tag means nothing new has arrived.
+_RESULT_CACHE_SIZE = 4096
+_result_cache: OrderedDict[UUID, tuple[tuple[int, int], VerificationResult]] = OrderedDict()
+
+
 @router.post("", response_model=VerificationResult)
 async def verify_session(request: VerificationRequest) -> VerificationResult:
     """
     Run HYBRID verification on a session combining volume, ML, and burst detection.
     """
-    # Get keystrokes
-    keystrokes = await keystroke_service.get_session_keystrokes(request.session_id)
+    # Get keystrokes, as column arrays
+    columns = await keystroke_service.get_session_keystroke_columns(request.session_id)
 
-    if not keystrokes:
+    if len(columns) == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No keystrokes found for session {request.session_id}",
         )
 
-    if len(keystrokes) < 10:
+    if len(columns) < 10:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Insufficient keystrokes for verification (minimum 10 required)",
         )
 
+    # Re-verifying an unchanged session returns the previous verdict,
+    # stamped with the time of this request
+    fingerprint = (len(columns), int(columns.sequence_nums[-1]))
+    cached = _result_cache.get(request.session_id)
+    if cached is not None and cached[0] == fingerprint:
+        _result_cache.move_to_end(request.session_id)
+        return cached[1].model_copy(update={"computed_at": datetime.now(_UTC)})
+
     # STEP 1: VOLUME-BASED ANALYSIS
     # Separate events by type
     # event_type: 1=keydown, 2=keyup, 3=paste, 4=ai_assistant
-
-    # Get all keydown/keyup events for timing analysis
-    timing_events = [k for k in keystrokes if k.event_type in (1, 2)]
+    event_types = columns.event_types
 
     # Detect AI bursts FIRST (sequences of extremely fast typing < 5ms)
-    ai_burst_keystrokes = set()
-    if len(timing_events) > 0:
-        consecutive_fast = 0
-        for i in range(len(timing_events)):
-            k = timing_events[i]
-            dwell = k.dwell_time if k.dwell_time is not None else 999.0
-            flight = k.flight_time if k.flight_time is not None else 999.0
-
-            # AI signature: < 5ms (human fast typing is 10-15ms minimum)
-            if dwell < 5.0 and flight < 5.0:
-                consecutive_fast += 1
-                # Mark as AI if part of burst (8+ consecutive fast keys)
-                if consecutive_fast >= 8:
-                    # Mark all keys in this burst
-                    for j in range(max(0, i - consecutive_fast + 1), i + 1):
-                        if j < len(timing_events):
-                            ai_burst_keystrokes.add(timing_events[j].sequence_num)
-            else:
-                consecutive_fast = 0
-
-    # Separate human vs AI keystrokes based on burst detection
-    keyboard_events = [
-        k
-        for k in keystrokes
-        if k.event_type == 1 and k.sequence_num not in ai_burst_keystrokes
-    ]
+    # among keydown/keyup events
+    # (timing features and the burst scan come from the same call)
+    is_timing = (event_types == 1) | (event_types == 2)
+    timing_idx = np.flatnonzero(is_timing)
+    timing_events = columns.select(is_timing)
+    (
+        timing_features,
+        feature_array,
+        burst_mask,
+        timing_burst_analysis,
+    ) = feature_extractor.extract_all(timing_events)
+    keydown = event_types == 1
+
+    # Start ML inference in a worker thread so it overlaps the volume
+    # analysis below. Human volume can't exceed the keydown count, so with
+    # fewer than 10 keydowns the model would never be consulted.
+    ml_task = None
+    if np.count_nonzero(keydown) >= 10:
+        ml_task = asyncio.create_task(
+            asyncio.to_thread(ml_inference.predict, feature_array)
+        )
 
-    paste_events = [k for k in keystrokes if k.event_type == 3]
-    ai_events = [k for k in keystrokes if k.event_type == 4]
+    # Burst membership as a bitmap over row positions (sequence numbers
+    # are client-driven and sparse, so they can't size an array)
+    in_burst = np.zeros(len(columns), dtype=np.bool_)
+    in_burst[timing_idx[burst_mask]] = True
 
-    # Count AI burst keystrokes as AI volume
-    ai_burst_volume = len(
-        [
-            k
-            for k in timing_events
-            if k.event_type == 1 and k.sequence_num in ai_burst_keystrokes
-        ]
-    )
+    # Separate human vs AI keystrokes based on burst detection; AI burst
+    # keystrokes count as AI volume
+    ai_burst_volume = int(np.count_nonzero(keydown & in_burst))
 
     # Calculate volumes (character counts)
-    human_volume = len(keyboard_events)
-    paste_volume = sum(k.key_code for k in paste_events)
-    ai_volume = sum(k.key_code for k in ai_events) + ai_burst_volume
+    human_volume = int(np.count_nonzero(keydown & ~in_burst))
+    paste_volume = int(columns.key_codes[event_types == 3].sum())
+    ai_volume = int(columns.key_codes[event_types == 4].sum()) + ai_burst_volume
 
     total_volume = human_volume + paste_volume + ai_volume
 
@@ -157,39 +230,42 @@ async def verify_session(request: VerificationRequest) -> VerificationResult:
     ml_is_human = True
     ml_class_label = None
     ml_probabilities = {}
-    features = {"total_keystrokes": len(keyboard_events), "avg_dwell_time": 0.0}
+    features = {
+        "total_keystrokes": human_volume,
+        "avg_dwell_time": 0.0,
+        "avg_flight_time": 0.0,
+        "std_dwell_time": 0.0,
+        "std_flight_time": 0.0,
+    }
 
-    if len(keyboard_events) >= 10:
-        try:
-            # Need full events (keydown + keyup) for timing analysis
-            full_keyboard_events = [k for k in keystrokes if k.event_type in (1, 2)]
-            features = feature_extractor.extract_features(full_keyboard_events)
-            feature_array = feature_extractor.features_to_array(features)
+    ml_failed = False
+    if human_volume >= 10:
+        # Need full events (keydown + keyup) for timing analysis
+        features = timing_features
 
+        try:
             # RUN ML MODEL (no longer shadow!)
-            ml_result = ml_inference.predict(feature_array)
+            ml_result = await ml_task
             ml_is_human = ml_result.get("is_human", True)
             ml_confidence = ml_result.get("confidence", 0.0)
             ml_class_label = ml_result.get("class_label")
             ml_probabilities = ml_result.get("probabilities", {})
+            ml_failed = "error" in ml_result
 
-        except Exception as e:
+        except Exception:
             # Fallback to volume-only if ML fails
-            print(f"[WARNING] ML inference failed: {e}")
-            import traceback
-
-            traceback.print_exc()
+            logger.exception("ML inference failed for session %s", request.session_id)
+            ml_failed = True
+    elif ml_task is not None:
+        # Bursts left too little human typing; the result isn't needed
+        ml_task.cancel()
 
     # STEP 3: BURST DETECTION (AI signature: consecutive fast keys)
+    # Same keydown/keyup scan as the volume analysis above
     burst_analysis = {"has_burst": False, "burst_count": 0, "burst_severity": 0.0}
 
-    if len(keyboard_events) >= 10:
-        try:
-            full_keyboard_events = [k for k in keystrokes if k.event_type in (1, 2)]
-            burst_analysis = feature_extractor.detect_ai_bursts(full_keyboard_events)
-        except Exception as e:
-            print(f"[WARNING] Burst detection failed: {e}")
-            pass
+    if human_volume >= 10:
+        burst_analysis = timing_burst_analysis
 
     # STEP 4: HYBRID DECISION LOGIC (IMPROVED FOR 95%+ ACCURACY)
     # Stricter thresholds and multi-signal consensus
@@ -206,6 +282,7 @@ async def verify_session(request: VerificationRequest) -> VerificationResult:
     verdict_label = "human_verified"
     friendly_feedback = ""
     detection_signals = []
+    num_suspicious_signals = 0
 
     # Signal 1: Volume analysis
     volume_violation = False
@@ -214,6 +291,7 @@ async def verify_session(request: VerificationRequest) -> VerificationResult:
         detection_signals.append("volume_high")
     elif pct_paste > VOLUME_THRESHOLD_STRICT or pct_ai > VOLUME_THRESHOLD_STRICT:
         detection_signals.append("volume_suspicious")
+        num_suspicious_signals += 1
 
     # Signal 2: Burst detection
     burst_detected = False
@@ -223,6 +301,7 @@ async def verify_session(request: VerificationRequest) -> VerificationResult:
             detection_signals.append("burst_detected")
         elif burst_analysis["burst_severity"] > 0:
             detection_signals.append("burst_suspicious")
+            num_suspicious_signals += 1
 
     # Signal 3: ML classification
     ml_non_human = False
@@ -231,19 +310,22 @@ async def verify_session(request: VerificationRequest) -> VerificationResult:
         detection_signals.append("ml_non_human")
     elif ml_class_label and not ml_is_human and ml_confidence > 0.5:
         detection_signals.append("ml_suspicious")
+        num_suspicious_signals += 1
 
     # DECISION LOGIC: Require consensus from multiple signals
-    num_strong_signals = len(
-        [
-            s
-            for s in detection_signals
-            if s in ["volume_high", "burst_detected", "ml_non_human"]
-        ]
-    )
-    num_suspicious_signals = len([s for s in detection_signals if "suspicious" in s])
+    num_strong_signals = volume_violation + burst_detected + ml_non_human
+    verdict = _VERDICT_LUT[
+        volume_violation * _SIG_VOLUME
+        | (pct_paste > pct_ai) * _SIG_PASTE_GT_AI
+        | burst_detected * _SIG_BURST
+        | ml_non_human * _SIG_ML
+        | (num_suspicious_signals >= 1) * _SIG_SUSPICIOUS
+        | (num_suspicious_signals >= 2) * _SIG_SUSPICIOUS_2
+        | (ml_confidence > 0.75) * _SIG_ML_CONFIDENT
+    ]
 
     # PRIORITY 1: Strong volume violation (>10% non-human)
-    if volume_violation and (pct_paste > pct_ai):
+    if verdict == _VERDICT_PASTE:
         final_is_human = False
         final_confidence = min(0.99, pct_paste * 1.2)
         verdict_label = "paste_detected"
@@ -251,7 +333,7 @@ async def verify_session(request: VerificationRequest) -> VerificationResult:
         if num_strong_signals >= 2:
             friendly_feedback += f" Additional signals: {', '.join(detection_signals)}."
 
-    elif volume_violation and (pct_ai >= pct_paste):
+    elif verdict == _VERDICT_AI:
         final_is_human = False
         final_confidence = min(0.99, pct_ai * 1.2)
         verdict_label = "ai_assisted"
@@ -260,26 +342,23 @@ async def verify_session(request: VerificationRequest) -> VerificationResult:
             friendly_feedback += f" Additional signals: {', '.join(detection_signals)}."
 
     # PRIORITY 2: Strong burst with volume support
-    elif burst_detected and (num_strong_signals >= 2 or num_suspicious_signals >= 1):
+    elif verdict == _VERDICT_BURST:
         final_is_human = False
         final_confidence = min(0.95, burst_analysis["burst_severity"] * 20)
         verdict_label = "ai_burst_detected"
         friendly_feedback = f"AI BURST DETECTED: {burst_analysis['burst_count']} burst sequences with max length {burst_analysis.get('max_burst_length', 0)} keys. Signals: {', '.join(detection_signals)}."
 
     # PRIORITY 3: ML strong detection with support
-    elif ml_non_human and (
-        num_strong_signals >= 2
-        or (num_suspicious_signals >= 1 and ml_confidence > 0.75)
-    ):
+    elif verdict == _VERDICT_ML:
         final_is_human = False
         final_confidence = ml_confidence
         verdict_label = ml_class_label if ml_class_label else "non_human_detected"
 
         # Get top ML probabilities for explanation
         if ml_probabilities:
-            top_classes = sorted(
-                ml_probabilities.items(), key=lambda x: x[1], reverse=True
-            )[:3]
+            top_classes = heapq.nlargest(
+                3, ml_probabilities.items(), key=lambda x: x[1]
+            )
             classes_str = ", ".join([f"{cls}({prob:.1%})" for cls, prob in top_classes])
             friendly_feedback = f"ML DETECTION: Pattern classified as '{ml_class_label}' with {ml_confidence:.1%} confidence. Top classes: {classes_str}."
         else:
@@ -289,7 +368,7 @@ async def verify_session(request: VerificationRequest) -> VerificationResult:
             friendly_feedback += f" Additional signals: {', '.join(detection_signals)}."
 
     # PRIORITY 4: Single strong signal or multiple suspicious signals
-    elif num_strong_signals == 1 or num_suspicious_signals >= 2:
+    elif verdict == _VERDICT_WARNINGS:
         # Suspicious but not conclusive - warn but don't fail
         final_is_human = True  # Benefit of doubt
 
@@ -323,9 +402,9 @@ async def verify_session(request: VerificationRequest) -> VerificationResult:
         verdict_label = "human_verified"
 
         if ml_class_label and ml_probabilities:
-            top_classes = sorted(
-                ml_probabilities.items(), key=lambda x: x[1], reverse=True
-            )[:2]
+            top_classes = heapq.nlargest(
+                2, ml_probabilities.items(), key=lambda x: x[1]
+            )
             classes_str = ", ".join([f"{cls}({prob:.1%})" for cls, prob in top_classes])
             friendly_feedback = f"HUMAN VERIFIED: {int(pct_human * 100)}% typed content ({human_volume}/{total_volume} chars). ML classification: {classes_str}. Confidence: {final_confidence:.1%}."
         else:
@@ -334,10 +413,10 @@ async def verify_session(request: VerificationRequest) -> VerificationResult:
     # Build comprehensive summary
     features_summary = {
         "total_keystrokes": features["total_keystrokes"],
-        "avg_dwell_time": round(features.get("avg_dwell_time", 0.0), 2),
-        "avg_flight_time": round(features.get("avg_flight_time", 0.0), 2),
-        "std_dwell_time": round(features.get("std_dwell_time", 0.0), 2),
-        "std_flight_time": round(features.get("std_flight_time", 0.0), 2),
+        "avg_dwell_time": round(features["avg_dwell_time"], 2),
+        "avg_flight_time": round(features["avg_flight_time"], 2),
+        "std_dwell_time": round(features["std_dwell_time"], 2),
+        "std_flight_time": round(features["std_flight_time"], 2),
         "volume_human": human_volume,
         "volume_paste": paste_volume,
         "volume_ai": ai_volume,
@@ -353,21 +432,30 @@ async def verify_session(request: VerificationRequest) -> VerificationResult:
         "burst_count": burst_analysis["burst_count"],
         "burst_severity": round(burst_analysis["burst_severity"], 3),
         "burst_max_length": burst_analysis.get("max_burst_length", 0),
-        "detection_signals": detection_signals
-        if "detection_signals" in locals()
-        else [],
+        "detection_signals": detection_signals,
         "input_analysis": verdict_label,
     }
 
-    return VerificationResult(
+    # Every field is produced above; skip re-validating them
+    result = VerificationResult.model_construct(
         session_id=request.session_id,
         is_human=final_is_human,
         confidence_score=max(0.0, min(1.0, final_confidence)),
         features_summary=features_summary,
-        computed_at=datetime.now(timezone.utc),
+        computed_at=datetime.now(_UTC),
         feedback=friendly_feedback,
     )
 
+    # A volume-only fallback after an ML failure is not cached, so the
+    # next request retries the model instead of repeating the fallback
+    if not ml_failed:
+        _result_cache[request.session_id] = (fingerprint, result)
+        _result_cache.move_to_end(request.session_id)
+        if len(_result_cache) > _RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+
+    return result
+
 
 @router.post("/content", response_model=ContentAnalysisResult)
 async def analyze_content(request: ContentAnalysisRequest) -> ContentAnalysisResult:
@@ -378,9 +466,9 @@ async def analyze_content(request: ContentAnalysisRequest) -> ContentAnalysisRes
             detail="Text too short for analysis (minimum 50 characters required)",
         )
 
-    result = content_analyzer.classify(request.text)
+    result = content_analyzer.classify_cached(request.text)
 
-    return ContentAnalysisResult(
+    return ContentAnalysisResult.model_construct(
         is_human=result["is_human"],
         confidence=result["confidence"],
         human_score=result["human_score"],
@@ -395,33 +483,46 @@ async def combined_verification(
 ) -> CombinedVerificationResult:
     """Run combined keystroke + content analysis verification."""
     # 1. Fetch Keystrokes
-    keystrokes = []
+    columns = KeystrokeColumns.empty()
     try:
-        keystrokes = await keystroke_service.get_session_keystrokes(request.session_id)
+        columns = await keystroke_service.get_session_keystroke_columns(
+            request.session_id
+        )
     except Exception:
         pass
 
     # VOLUME-BASED VERIFICATION (MVP)
     # 1. Separate events
-    keyboard_events = [k for k in keystrokes if k.event_type == 1]
-    paste_events = [k for k in keystrokes if k.event_type == 3]
-    ai_events = [k for k in keystrokes if k.event_type == 4]
+    event_types = columns.event_types
 
     # 2. Calculate Volumes (Character Counts)
-    human_volume = len(keyboard_events)
-    paste_volume = sum(k.key_code for k in paste_events)
-    ai_volume = sum(k.key_code for k in ai_events)
+    human_volume = int(np.count_nonzero(event_types == 1))
+    paste_volume = int(columns.key_codes[event_types == 3].sum())
+    ai_volume = int(columns.key_codes[event_types == 4].sum())
 
     total_volume = human_volume + paste_volume + ai_volume
 
     if total_volume == 0:
-        pct_human = 0.0
-        pct_paste = 0.0
-        pct_ai = 0.0
-    else:
-        pct_human = human_volume / total_volume
-        pct_paste = paste_volume / total_volume
-        pct_ai = ai_volume / total_volume
+        # No recorded input at all: nothing for content analysis to
+        # corroborate, so return the zero-volume verdict directly
+        return CombinedVerificationResult.model_construct(
+            session_id=request.session_id,
+            is_human=True,
+            confidence_score=0.0,
+            verdict="human_verified",
+            keystroke_analysis={
+                "is_human": True,
+                "confidence": 0.0,
+                "features": {"volume_human": 0, "volume_paste": 0, "volume_ai": 0},
+            },
+            content_analysis={},
+            combined_features={"keystroke_weight": 1.0, "content_weight": 0.0},
+            computed_at=datetime.now(_UTC),
+        )
+
+    pct_human = human_volume / total_volume
+    pct_paste = paste_volume / total_volume
+    pct_ai = ai_volume / total_volume
 
     # 3. Determine Verdict (Strict Thresholds)
     TOLERANCE_THRESHOLD = 0.10  # 10% tolerance
@@ -446,12 +547,14 @@ async def combined_verification(
         final_confidence = pct_human
         final_verdict = "human_verified"
 
-    # Content analysis (Shadow)
+    # Content analysis (Shadow). Skipped when the keystrokes already show
+    # the text was almost entirely pasted or inserted: the verdict can't
+    # change and classification is the most expensive step here.
     content_result = {}
-    if len(request.text_content) >= 50:
-        content_result = content_analyzer.classify(request.text_content)
+    if len(request.text_content) >= 50 and pct_paste < 0.9 and pct_ai < 0.9:
+        content_result = content_analyzer.classify_cached(request.text_content)
 
-    return CombinedVerificationResult(
+    return CombinedVerificationResult.model_construct(
         session_id=request.session_id,
         is_human=final_is_human,
         confidence_score=max(0.0, min(1.0, final_confidence)),
@@ -470,7 +573,7 @@ async def combined_verification(
             "keystroke_weight": 1.0,  # Trust volume 100%
             "content_weight": 0.0,
         },
-        computed_at=datetime.now(timezone.utc),
+        computed_at=datetime.now(_UTC),
     )
 
 
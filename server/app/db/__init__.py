@@ -1,6 +1,6 @@
 """Database module."""
 
-from app.db.database import init_db, close_db, get_pool, get_connection
+from app.db.database import init_db, close_db, get_pool, get_connection, db_connection
 from app.db import queries
 
-__all__ = ["init_db", "close_db", "get_pool", "get_connection", "queries"]
+__all__ = ["init_db", "close_db", "get_pool", "get_connection", "db_connection", "queries"]
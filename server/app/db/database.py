@@ -18,8 +18,13 @@ async def init_db() -> None:
     try:
         _pool = await asyncpg.create_pool(
             settings.database_url,
-            min_size=2,
+            min_size=settings.database_pool_min_size,
             max_size=settings.database_pool_size,
+            max_inactive_connection_lifetime=settings.database_pool_max_inactive_lifetime,
+            command_timeout=settings.database_command_timeout,
+            # Every query text is prepared once per connection and reused
+            # from this cache, skipping parse/plan on repeat calls
+            statement_cache_size=settings.database_statement_cache_size,
         )
         print("✓ Database connection pool initialized")
     except Exception as e:
@@ -49,3 +54,9 @@ async def get_connection() -> AsyncGenerator[asyncpg.Connection, None]:
     pool = get_pool()
     async with pool.acquire() as conn:
         yield conn
+
+
+async def db_connection() -> AsyncGenerator[asyncpg.Connection, None]:
+    """FastAPI dependency yielding a pooled connection for one request."""
+    async with get_pool().acquire() as conn:
+        yield conn
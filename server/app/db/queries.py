@@ -45,6 +45,18 @@ GET_SESSION_KEYSTROKES = """
     ORDER BY sequence_num ASC
 """
 
+# One row of per-column arrays (NULL when the session has no keystrokes)
+GET_SESSION_KEYSTROKE_COLUMNS = """
+    SELECT
+        array_agg(event_type ORDER BY sequence_num) as event_types,
+        array_agg(key_code ORDER BY sequence_num) as key_codes,
+        array_agg(sequence_num ORDER BY sequence_num) as sequence_nums,
+        array_agg(dwell_time ORDER BY sequence_num) as dwell_times,
+        array_agg(flight_time ORDER BY sequence_num) as flight_times
+    FROM keystrokes
+    WHERE session_id = $1
+"""
+
 # Feature queries
 COMPUTE_SESSION_FEATURES = """
     SELECT 
@@ -1,5 +1,6 @@
 """HumanSign API - Main FastAPI application."""
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -16,7 +17,9 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
     await init_db()
-    ml_inference.warmup()
+    # Warm up on the executor verify_session runs inference on, so the
+    # worker thread and its IOBinding exist before the first request
+    await asyncio.to_thread(ml_inference.warmup)
     
     yield
     
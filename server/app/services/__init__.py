@@ -1,12 +1,17 @@
 """Services module."""
 
-from app.services.keystroke_service import keystroke_service, KeystrokeService
+from app.services.keystroke_service import (
+    keystroke_service,
+    KeystrokeService,
+    KeystrokeColumns,
+)
 from app.services.feature_extractor import feature_extractor, FeatureExtractor
 from app.services.ml_inference import ml_inference, MLInferenceService
 
 __all__ = [
     "keystroke_service",
     "KeystrokeService",
+    "KeystrokeColumns",
     "feature_extractor",
     "FeatureExtractor",
     "ml_inference",
@@ -6,8 +6,11 @@ Handles:
 - Refresh token management
 """
 
+import asyncio
+import os
 import secrets
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Any
 from uuid import UUID
@@ -40,12 +43,18 @@ class AuthService:
     
     def __init__(self):
         self._settings = get_settings()
+        # bcrypt releases the GIL, so worker threads hash in parallel across
+        # cores. A pool of its own keeps slow hashes from tying up the
+        # default executor that ML inference runs on.
+        self._hash_pool = ThreadPoolExecutor(
+            max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt"
+        )
     
     # ==================== PASSWORD HASHING ====================
     
     def hash_password(self, password: str) -> str:
-        """Hash a password using bcrypt."""
-        salt = bcrypt.gensalt(rounds=12)
+        """Hash a password using bcrypt at the configured cost."""
+        salt = bcrypt.gensalt(rounds=self._settings.bcrypt_cost)
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
     
@@ -59,6 +68,31 @@ class AuthService:
         except Exception:
             return False
     
+    async def hash_password_async(self, password: str) -> str:
+        """Hash a password on the bcrypt pool, off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._hash_pool, self.hash_password, password)
+    
+    async def verify_password_async(self, password: str, hashed: str) -> bool:
+        """Verify a password on the bcrypt pool, off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._hash_pool, self.verify_password, password, hashed
+        )
+    
+    def password_needs_rehash(self, hashed: str) -> bool:
+        """
+        Check whether a bcrypt hash was made with a different cost.
+        
+        Stored hashes at any other cost than settings.bcrypt_cost are
+        upgraded (or downgraded) on the user's next successful login.
+        """
+        # Format: $2b$<cost>$<salt+hash>
+        parts = hashed.split("$")
+        if len(parts) != 4 or not parts[2].isdigit():
+            return True
+        return int(parts[2]) != self._settings.bcrypt_cost
+    
     # ==================== JWT TOKENS ====================
     
     def create_access_token(self, user_id: UUID, extra_claims: dict[str, Any] | None = None) -> str:
@@ -93,7 +127,7 @@ class AuthService:
         raw_token = secrets.token_urlsafe(64)
         
         # Hash the token for storage (never store raw tokens)
-        token_hash = hashlib.sha256(raw_token.encode()).hexdigest()
+        token_hash = self.hash_token(raw_token)
         
         expires_at = datetime.now(timezone.utc) + timedelta(
             days=self._settings.refresh_token_expire_days
@@ -102,7 +136,12 @@ class AuthService:
         return raw_token, token_hash, expires_at
     
     def hash_token(self, token: str) -> str:
-        """Hash a token for lookup."""
+        """
+        Hash a token for lookup.
+        
+        Tokens are 512-bit random strings, so a single fast SHA-256 is
+        enough; no slow password hash is needed here.
+        """
         return hashlib.sha256(token.encode()).hexdigest()
     
     def create_token_pair(self, user_id: UUID) -> tuple[TokenPair, str, datetime]:
@@ -112,16 +151,23 @@ class AuthService:
         Returns:
             tuple of (TokenPair, refresh_token_hash, refresh_expires_at)
         """
-        access_token = self.create_access_token(user_id)
         refresh_token, token_hash, expires_at = self.create_refresh_token()
+        token_pair = self.complete_token_pair(user_id, refresh_token)
         
-        token_pair = TokenPair(
-            access_token=access_token,
+        return token_pair, token_hash, expires_at
+    
+    def complete_token_pair(self, user_id: UUID, refresh_token: str) -> TokenPair:
+        """
+        Pair an already-created refresh token with a new access token.
+        
+        Lets callers store the refresh token hash before the user id is
+        known (e.g. refresh rotation in a single statement).
+        """
+        return TokenPair(
+            access_token=self.create_access_token(user_id),
             refresh_token=refresh_token,
             expires_in=self._settings.access_token_expire_minutes * 60
         )
-        
-        return token_pair, token_hash, expires_at
     
     def verify_access_token(self, token: str) -> Optional[TokenPayload]:
         """Verify and decode an access token."""
@@ -156,7 +202,7 @@ class AuthService:
             tuple of (raw_token, token_hash, expires_at)
         """
         raw_token = secrets.token_urlsafe(32)
-        token_hash = hashlib.sha256(raw_token.encode()).hexdigest()
+        token_hash = self.hash_token(raw_token)
         expires_at = datetime.now(timezone.utc) + timedelta(hours=24)
         
         return raw_token, token_hash, expires_at
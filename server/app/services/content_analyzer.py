@@ -14,9 +14,9 @@ Human text is typically MORE random and variable.
 AI text is typically MORE uniform and predictable.
 """
 
-import math
+import hashlib
 import re
-from collections import Counter
+from collections import Counter, OrderedDict
 from typing import Any
 import numpy as np
 
@@ -37,22 +37,54 @@ class ContentAnalyzer:
         'too', 'very', 'just', 'also', 'now', 'here', 'there', 'then', 'if'
     }
     
+    # Max classify() results kept by classify_cached
+    CLASSIFY_CACHE_SIZE = 1024
+    
+    WORD_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+    SENTENCE_END_PATTERN = re.compile(r'[.!?]+')
+    
+    PUNCTUATION = '.,!?;:"-\'()[]{}'
+    # Every byte that isn't punctuation, for bytes.translate(None, delete)
+    NON_PUNCTUATION_BYTES = bytes(range(256)).translate(None, PUNCTUATION.encode())
+    
     def __init__(self):
-        pass
+        # LRU of classify() results keyed by a BLAKE2b digest of the text
+        self._classify_cache: OrderedDict[bytes, dict[str, Any]] = OrderedDict()
     
     def tokenize(self, text: str) -> list[str]:
         """Simple word tokenization."""
         # Remove special characters, keep alphanumeric and apostrophes
         text = text.lower()
-        words = re.findall(r"[a-z]+(?:'[a-z]+)?", text)
+        words = self.WORD_PATTERN.findall(text)
         return words
     
     def get_sentences(self, text: str) -> list[str]:
         """Split text into sentences."""
         # Split on sentence-ending punctuation
-        sentences = re.split(r'[.!?]+', text)
+        sentences = self.SENTENCE_END_PATTERN.split(text)
         return [s.strip() for s in sentences if s.strip()]
     
+    def tokenize_with_sentence_lengths(self, text: str) -> tuple[list[str], list[int]]:
+        """
+        Tokenize text along with the word count of each sentence.
+        
+        Same result as tokenize(text) and len(tokenize(s)) for each of
+        get_sentences(text), without tokenizing every sentence again.
+        """
+        text = text.lower()
+        words = self.WORD_PATTERN.findall(text)
+        
+        # Collapse each word to one 'w' (any other 'w' is part of a word),
+        # then count markers per sentence; whitespace-only pieces aren't
+        # sentences
+        marked = self.WORD_PATTERN.sub('w', text)
+        sentence_lengths = [
+            piece.count('w')
+            for piece in self.SENTENCE_END_PATTERN.split(marked)
+            if piece and not piece.isspace()
+        ]
+        return words, sentence_lengths
+    
     def extract_features(self, text: str) -> dict[str, Any]:
         """
         Extract content analysis features from text.
@@ -64,8 +96,7 @@ class ContentAnalyzer:
         if not text or len(text) < 50:
             return self._empty_features()
         
-        words = self.tokenize(text)
-        sentences = self.get_sentences(text)
+        words, sentence_lengths = self.tokenize_with_sentence_lengths(text)
         
         if len(words) < 10:
             return self._empty_features()
@@ -77,23 +108,30 @@ class ContentAnalyzer:
         unique_words = len(word_counts)
         total_words = len(words)
         
+        # Per-word properties are computed once per distinct word and
+        # broadcast to tokens through integer word ids
+        vocabulary = list(word_counts)
+        word_ids = self._word_ids(words, vocabulary)
+        vocabulary_counts = np.fromiter(word_counts.values(), dtype=np.int64, count=unique_words)
+        
         # Type-Token Ratio (vocabulary diversity)
         # Higher = more diverse vocabulary (more human-like)
         features['vocabulary_diversity'] = unique_words / total_words
         
         # Hapax Legomena ratio (words appearing only once)
         # Higher = more unique expressions (more human-like)
-        hapax = sum(1 for count in word_counts.values() if count == 1)
+        hapax = int(np.count_nonzero(vocabulary_counts == 1))
         features['hapax_ratio'] = hapax / unique_words if unique_words > 0 else 0
         
         # Content word ratio (non-stop-words)
-        content_words = [w for w in words if w not in self.STOP_WORDS]
-        features['content_word_ratio'] = len(content_words) / total_words
+        is_stop_word = np.fromiter(
+            (w in self.STOP_WORDS for w in vocabulary), dtype=np.bool_, count=unique_words
+        )
+        stop_word_count = int(vocabulary_counts[is_stop_word].sum())
+        features['content_word_ratio'] = (total_words - stop_word_count) / total_words
         
         # === SENTENCE FEATURES ===
-        if sentences:
-            sentence_lengths = [len(self.tokenize(s)) for s in sentences]
-            
+        if sentence_lengths:
             # Sentence length mean and std
             features['avg_sentence_length'] = float(np.mean(sentence_lengths))
             features['sentence_length_std'] = float(np.std(sentence_lengths))
@@ -110,7 +148,8 @@ class ContentAnalyzer:
             features['sentence_length_cv'] = 0.0
         
         # === WORD LENGTH FEATURES ===
-        word_lengths = [len(w) for w in words]
+        vocabulary_lengths = np.fromiter(map(len, vocabulary), dtype=np.int64, count=unique_words)
+        word_lengths = vocabulary_lengths[word_ids]
         features['avg_word_length'] = float(np.mean(word_lengths))
         features['word_length_std'] = float(np.std(word_lengths))
         
@@ -122,109 +161,132 @@ class ContentAnalyzer:
         
         # === BURSTINESS FEATURES ===
         # Measure how "bursty" word usage is (humans tend to be more bursty)
-        features['burstiness'] = float(self._calculate_burstiness(words))
+        features['burstiness'] = float(self._calculate_burstiness(word_ids))
         
         # === N-GRAM REPETITION ===
         # AI text tends to have more repeated phrases
-        features['bigram_repetition'] = float(self._calculate_ngram_repetition(words, 2))
-        features['trigram_repetition'] = float(self._calculate_ngram_repetition(words, 3))
+        features['bigram_repetition'] = float(self._calculate_ngram_repetition(word_ids, 2))
+        features['trigram_repetition'] = float(self._calculate_ngram_repetition(word_ids, 3))
         
         # === ENTROPY ===
         # Character-level entropy (randomness measure)
         features['char_entropy'] = float(self._calculate_entropy(text))
         
         # Word-level entropy
-        features['word_entropy'] = float(self._calculate_word_entropy(words))
+        features['word_entropy'] = float(self._calculate_word_entropy(word_ids))
         
         # === PUNCTUATION FEATURES ===
         features['punctuation_ratio'] = float(self._calculate_punctuation_ratio(text))
         
         # === RARE WORD USAGE ===
         # Proxy for perplexity - uncommon words
-        features['long_word_ratio'] = float(sum(1 for w in words if len(w) > 8) / total_words)
+        features['long_word_ratio'] = float(np.count_nonzero(word_lengths > 8) / total_words)
         
         # === COMPUTE FINAL SCORE ===
         features['human_score'] = float(self._compute_human_score(features))
         
         return features
     
-    def _calculate_burstiness(self, words: list[str]) -> float:
+    def _word_ids(self, words: list[str], vocabulary: list[str]) -> np.ndarray:
+        """Integer id per word: its index in vocabulary (distinct words)."""
+        index = dict(zip(vocabulary, range(len(vocabulary))))
+        return np.fromiter(map(index.__getitem__, words), dtype=np.int64, count=len(words))
+    
+    def _calculate_burstiness(self, word_ids: np.ndarray) -> float:
         """
         Calculate burstiness of word usage.
         Human text tends to have "bursty" patterns where certain words
         cluster together, while AI text is more uniform.
         """
-        if len(words) < 20:
+        if len(word_ids) < 20:
             return 0.0
         
-        word_counts = Counter(words)
+        # Positions grouped by word, ascending within each word; gaps
+        # between neighbours of the same word are its inter-arrival times
+        positions = np.argsort(word_ids, kind='stable')
+        grouped_ids = word_ids[positions]
+        same_word = grouped_ids[1:] == grouped_ids[:-1]
+        interval_ids = grouped_ids[1:][same_word]
+        intervals = np.diff(positions)[same_word].astype(np.float64)
         
-        # For words appearing multiple times, calculate inter-arrival times
-        bursts = []
-        for word, count in word_counts.items():
-            if count >= 2:
-                positions = [i for i, w in enumerate(words) if w == word]
-                if len(positions) >= 2:
-                    intervals = [positions[i+1] - positions[i] for i in range(len(positions)-1)]
-                    if intervals:
-                        mean_interval = np.mean(intervals)
-                        std_interval = np.std(intervals)
-                        if mean_interval > 0:
-                            # Coefficient of variation of intervals
-                            bursts.append(std_interval / mean_interval)
-        
-        return np.mean(bursts) if bursts else 0.0
+        if len(intervals) == 0:
+            return 0.0
+        
+        # Per-word mean and (population) std of intervals, for every word
+        # appearing at least twice
+        num_words = int(word_ids.max()) + 1
+        counts = np.bincount(interval_ids, minlength=num_words)
+        sums = np.bincount(interval_ids, weights=intervals, minlength=num_words)
+        means = sums / np.maximum(counts, 1)
+        deviations = intervals - means[interval_ids]
+        squares = np.bincount(interval_ids, weights=deviations * deviations, minlength=num_words)
+        
+        repeated = counts > 0
+        stds = np.sqrt(squares[repeated] / counts[repeated])
+        
+        # Coefficient of variation of intervals (every interval is >= 1)
+        bursts = stds / means[repeated]
+        return float(np.mean(bursts))
     
-    def _calculate_ngram_repetition(self, words: list[str], n: int) -> float:
+    def _calculate_ngram_repetition(self, word_ids: np.ndarray, n: int) -> float:
         """Calculate n-gram repetition ratio (lower = more repetitive = more AI-like)."""
-        if len(words) < n + 1:
+        if len(word_ids) < n + 1:
             return 1.0
         
-        ngrams = [tuple(words[i:i+n]) for i in range(len(words) - n + 1)]
-        unique_ngrams = len(set(ngrams))
-        total_ngrams = len(ngrams)
+        total_ngrams = len(word_ids) - n + 1
+        radix = int(word_ids.max()) + 1
+        
+        if radix ** n <= np.iinfo(np.int64).max:
+            # Each n-gram as one base-`radix` integer: exact, no collisions
+            codes = word_ids[:total_ngrams]
+            for offset in range(1, n):
+                codes = codes * radix + word_ids[offset:offset + total_ngrams]
+            unique_ngrams = len(np.unique(codes))
+        else:
+            windows = np.lib.stride_tricks.sliding_window_view(word_ids, n)
+            unique_ngrams = len(np.unique(windows, axis=0))
         
-        return unique_ngrams / total_ngrams if total_ngrams > 0 else 1.0
+        return unique_ngrams / total_ngrams
     
     def _calculate_entropy(self, text: str) -> float:
         """Calculate Shannon entropy of character distribution."""
-        text = text.lower()
-        char_counts = Counter(text)
-        total = len(text)
-        
-        if total == 0:
+        if not text:
             return 0.0
         
-        entropy = 0.0
-        for count in char_counts.values():
-            p = count / total
-            if p > 0:
-                entropy -= p * math.log2(p)
+        # Code points as integers (UTF-32 keeps one unit per character)
+        codes = np.frombuffer(
+            text.lower().encode('utf-32-le', 'surrogatepass'), dtype=np.uint32
+        )
+        if codes.max() < 256:
+            counts = np.bincount(codes, minlength=256)
+            counts = counts[counts > 0]
+        else:
+            counts = np.unique(codes, return_counts=True)[1]
         
-        return entropy
+        return self._entropy_from_counts(counts)
     
-    def _calculate_word_entropy(self, words: list[str]) -> float:
+    def _calculate_word_entropy(self, word_ids: np.ndarray) -> float:
         """Calculate Shannon entropy of word distribution."""
-        if not words:
+        if len(word_ids) == 0:
             return 0.0
         
-        word_counts = Counter(words)
-        total = len(words)
-        
-        entropy = 0.0
-        for count in word_counts.values():
-            p = count / total
-            if p > 0:
-                entropy -= p * math.log2(p)
-        
-        return entropy
+        return self._entropy_from_counts(np.bincount(word_ids))
+    
+    def _entropy_from_counts(self, counts: np.ndarray) -> float:
+        """Shannon entropy (bits) of a distribution given positive counts."""
+        p = counts / counts.sum()
+        return float(0.0 - np.sum(p * np.log2(p)))  # 0.0, not -0.0, for one symbol
     
     def _calculate_punctuation_ratio(self, text: str) -> float:
         """Calculate ratio of punctuation to total characters."""
         if not text:
             return 0.0
         
-        punctuation = sum(1 for c in text if c in '.,!?;:"-\'()[]{}')
+        # Punctuation is ASCII, and ASCII bytes never occur inside a
+        # multi-byte UTF-8 sequence, so counting in the encoded bytes is
+        # exact (the ratio is still per character)
+        encoded = text.encode('utf-8', 'surrogatepass')
+        punctuation = len(encoded.translate(None, self.NON_PUNCTUATION_BYTES))
         return punctuation / len(text)
     
         return min(1.0, max(0.0, score))
@@ -339,6 +401,27 @@ class ContentAnalyzer:
             'verdict': verdict,
             'features': features,
         }
+    
+    def classify_cached(self, text: str) -> dict[str, Any]:
+        """
+        classify() with results memoized by content.
+        
+        The same text is often submitted again (retries, re-verifying a
+        session), and classification is a pure function of the text.
+        """
+        key = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        
+        result = self._classify_cache.get(key)
+        if result is None:
+            result = self.classify(text)
+            self._classify_cache[key] = result
+            if len(self._classify_cache) > self.CLASSIFY_CACHE_SIZE:
+                self._classify_cache.popitem(last=False)
+        else:
+            self._classify_cache.move_to_end(key)
+        
+        # Copy so callers can't mutate the cached entry
+        return {**result, 'features': dict(result['features'])}
 
 
 # Singleton instance
@@ -10,6 +10,11 @@ from uuid import UUID
 from pydantic import BaseModel
 
 
+# Text is encoded and hashed this many characters at a time, so hashing a
+# large document never holds a full UTF-8 copy of it
+HASH_CHUNK_CHARS = 1 << 20
+
+
 class SignedBundle(BaseModel):
     """Signed document bundle."""
     version: str = "1.0"
@@ -30,19 +35,30 @@ class CryptoService:
         from app.config import get_settings
         self._settings = get_settings()
     
-    def hash_content(self, content: str) -> str:
-        """Create SHA-256 hash of content."""
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    def hash_content(self, content: str | bytes) -> str:
+        """Create SHA-256 hash of content (UTF-8 for text)."""
+        if isinstance(content, bytes):
+            return hashlib.sha256(content).hexdigest()
+        
+        hasher = hashlib.sha256()
+        for start in range(0, len(content), HASH_CHUNK_CHARS):
+            hasher.update(content[start:start + HASH_CHUNK_CHARS].encode('utf-8'))
+        return hasher.hexdigest()
     
     def hash_document(self, 
                       content: str, 
                       session_id: UUID, 
                       keystroke_count: int,
                       classification: str,
-                      confidence: float) -> str:
-        """Create hash of document with verification metadata."""
+                      confidence: float,
+                      content_hash: str | None = None) -> str:
+        """Create hash of document with verification metadata.
+        
+        Pass content_hash when the caller already has it, to avoid hashing
+        the content a second time.
+        """
         data = {
-            "content_hash": self.hash_content(content),
+            "content_hash": content_hash or self.hash_content(content),
             "session_id": str(session_id),
             "keystroke_count": keystroke_count,
             "classification": classification,
@@ -87,7 +103,8 @@ class CryptoService:
         
         # Create document hash including all verification data
         doc_hash = self.hash_document(
-            content, session_id, keystroke_count, classification, confidence
+            content, session_id, keystroke_count, classification, confidence,
+            content_hash=content_hash,
         )
         
         metadata = {
@@ -6,6 +6,7 @@ from typing import Any
 import numpy as np
 
 from app.models import ProcessedKeystroke
+from app.services.keystroke_service import KeystrokeColumns
 
 # Features expected by the specific ML model (MUST match train_multiclass.py)
 MODEL_FEATURES = [
@@ -32,6 +33,12 @@ MODEL_FEATURES = [
     "burst_count",
 ]
 
+# AI burst signature: both dwell AND flight under 5ms (human fast typing is
+# typically 10-15ms minimum) for 8+ consecutive keys (raised from 5 to avoid
+# false positives on fast human typing)
+BURST_THRESHOLD_MS = 5.0
+BURST_MIN_LENGTH = 8
+
 
 class FeatureExtractor:
     """Extract ML features from keystroke data."""
@@ -48,17 +55,22 @@ class FeatureExtractor:
         if not keystrokes:
             return self._empty_features()
 
-        # Filter to valid events
-        # We need lists of values for vectorized ops
-        dwells_all = np.array(
-            [k.dwell_time for k in keystrokes if k.dwell_time is not None]
+        return self.extract_features_from_columns(
+            KeystrokeColumns.from_keystrokes(keystrokes)
         )
-        flights_all = np.array(
-            [k.flight_time for k in keystrokes if k.flight_time is not None]
-        )
-        key_codes = np.array(
-            [k.key_code for k in keystrokes if k.event_type == 1]
-        )  # Keydowns only for codes
+
+    def extract_features_from_columns(
+        self,
+        columns: KeystrokeColumns,
+    ) -> dict[str, Any]:
+        """Extract features from keystrokes already in column form."""
+        if len(columns) == 0:
+            return self._empty_features()
+
+        # Filter to valid events
+        dwells_all = columns.dwell_times[~np.isnan(columns.dwell_times)]
+        flights_all = columns.flight_times[~np.isnan(columns.flight_times)]
+        key_codes = columns.key_codes[columns.event_types == 1]  # Keydowns only for codes
 
         # 1. Total Keystrokes
         total_keystrokes = len(dwells_all)
@@ -175,18 +187,10 @@ class FeatureExtractor:
         if len(flight_times) == 0:
             return 0.0
 
-        fast_mask = flight_times < 50
-        burst_count = 0
-        in_burst = False
-
-        for is_fast in fast_mask:
-            if is_fast and not in_burst:
-                burst_count += 1
-                in_burst = True
-            elif not is_fast:
-                in_burst = False
-
-        return float(burst_count)
+        # Each burst starts where the fast mask rises from False to True
+        fast_mask = (flight_times < 50).astype(np.int8)
+        rises = np.diff(fast_mask, prepend=0) == 1
+        return float(np.count_nonzero(rises))
 
     def _compute_wpm(self, char_count: int, duration_ms: float) -> float:
         """Compute words per minute (assuming 5 chars = 1 word)."""
@@ -212,7 +216,7 @@ class FeatureExtractor:
             - burst_severity: ratio of burst keys to total keys
             - max_burst_length: longest burst sequence
         """
-        if len(keystrokes) < 8:
+        if len(keystrokes) < BURST_MIN_LENGTH:
             return {
                 "has_burst": False,
                 "burst_count": 0,
@@ -221,48 +225,75 @@ class FeatureExtractor:
                 "max_burst_length": 0,
             }
 
-        consecutive_fast = 0
-        burst_positions = []
-        current_burst_start = -1
-        max_burst_length = 0
-
-        for i, k in enumerate(keystrokes):
-            dwell = k.dwell_time if k.dwell_time is not None else 999.0
-            flight = k.flight_time if k.flight_time is not None else 999.0
-
-            # AI signature: both dwell AND flight extremely fast
-            # Threshold: 5ms (human fast typing is typically 10-15ms minimum)
-            if dwell < 5.0 and flight < 5.0:
-                if consecutive_fast == 0:
-                    current_burst_start = i
-                consecutive_fast += 1
-
-                # Mark as burst if we reach 8 consecutive fast keys
-                # Increased from 5 to avoid false positives on fast human typing
-                if consecutive_fast == 8 and current_burst_start not in burst_positions:
-                    burst_positions.append(current_burst_start)
-            else:
-                # Burst broken - record length and reset
-                if consecutive_fast > 0:
-                    max_burst_length = max(max_burst_length, consecutive_fast)
-                consecutive_fast = 0
-                current_burst_start = -1
-
-        # Check final sequence
-        if consecutive_fast > 0:
-            max_burst_length = max(max_burst_length, consecutive_fast)
-
-        total_keys = len(keystrokes)
-        burst_severity = len(burst_positions) / total_keys if total_keys > 0 else 0.0
-
-        return {
+        # float64 conversion turns missing (None) timings into NaN
+        dwells = np.array([k.dwell_time for k in keystrokes], dtype=np.float64)
+        flights = np.array([k.flight_time for k in keystrokes], dtype=np.float64)
+        _, burst_analysis = self.scan_bursts(dwells, flights)
+        return burst_analysis
+
+    def scan_bursts(
+        self,
+        dwells: np.ndarray,
+        flights: np.ndarray,
+    ) -> tuple[np.ndarray, dict[str, Any]]:
+        """
+        Find AI bursts in per-key dwell/flight arrays.
+
+        A key is fast when both its dwell and flight are under
+        BURST_THRESHOLD_MS (a missing/NaN time is never fast); a burst is a
+        run of BURST_MIN_LENGTH or more consecutive fast keys. Runs are
+        located from the edges of the fast mask, so the scan is a few
+        vectorized passes with no Python loop.
+
+        Returns:
+            tuple of (mask of keys inside a burst, burst analysis dict as
+            returned by detect_ai_bursts)
+        """
+        fast = (dwells < BURST_THRESHOLD_MS) & (flights < BURST_THRESHOLD_MS)
+
+        edges = np.diff(fast.astype(np.int8), prepend=0, append=0)
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        lengths = ends - starts
+        is_burst = lengths >= BURST_MIN_LENGTH
+
+        marks = np.zeros(len(fast) + 1, dtype=np.int32)
+        marks[starts[is_burst]] += 1
+        marks[ends[is_burst]] -= 1
+        burst_mask = np.cumsum(marks[:-1]) > 0
+
+        burst_positions = starts[is_burst].tolist()
+        total_keys = len(fast)
+
+        return burst_mask, {
             "has_burst": len(burst_positions) > 0,
             "burst_count": len(burst_positions),
             "burst_positions": burst_positions,
-            "burst_severity": burst_severity,
-            "max_burst_length": max_burst_length,
+            "burst_severity": len(burst_positions) / total_keys if total_keys > 0 else 0.0,
+            # Longest run of fast keys, burst or not
+            "max_burst_length": int(lengths.max(initial=0)),
         }
 
+    def extract_all(
+        self,
+        columns: KeystrokeColumns,
+    ) -> tuple[dict[str, Any], np.ndarray, np.ndarray, dict[str, Any]]:
+        """
+        Everything verification needs from one set of keydown/keyup columns.
+
+        Features, the model input row and the AI burst scan all read the
+        same dwell/flight arrays, so callers make a single call instead of
+        rebuilding inputs for each.
+
+        Returns:
+            tuple of (features, feature_array, burst_mask, burst_analysis)
+        """
+        features = self.extract_features_from_columns(columns)
+        burst_mask, burst_analysis = self.scan_bursts(
+            columns.dwell_times, columns.flight_times
+        )
+        return features, self.features_to_array(features), burst_mask, burst_analysis
+
     def _empty_features(self) -> dict[str, Any]:
         """Return empty features dict."""
         return {feat: 0.0 for feat in MODEL_FEATURES + ["avg_wpm", "error_rate"]}
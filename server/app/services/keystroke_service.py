@@ -1,13 +1,79 @@
 """Keystroke processing service."""
 
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Iterable, Optional
 from uuid import UUID
 
+import numpy as np
+
 from app.db import get_connection, queries
 from app.models import KeystrokeBatchRequest, ProcessedKeystroke
 
 
+@dataclass(frozen=True)
+class KeystrokeColumns:
+    """
+    A session's keystrokes as parallel arrays, in sequence order.
+
+    Missing dwell/flight times are NaN.
+    """
+
+    event_types: np.ndarray  # int8
+    key_codes: np.ndarray  # int64
+    sequence_nums: np.ndarray  # int64
+    dwell_times: np.ndarray  # float64
+    flight_times: np.ndarray  # float64
+
+    def __len__(self) -> int:
+        return len(self.event_types)
+
+    def select(self, mask: np.ndarray) -> "KeystrokeColumns":
+        """Rows where ``mask`` is True."""
+        return KeystrokeColumns(
+            event_types=self.event_types[mask],
+            key_codes=self.key_codes[mask],
+            sequence_nums=self.sequence_nums[mask],
+            dwell_times=self.dwell_times[mask],
+            flight_times=self.flight_times[mask],
+        )
+
+    @classmethod
+    def empty(cls) -> "KeystrokeColumns":
+        """No keystrokes."""
+        return cls.from_lists([], [], [], [], [])
+
+    @classmethod
+    def from_lists(
+        cls,
+        event_types: Iterable[int],
+        key_codes: Iterable[int],
+        sequence_nums: Iterable[int],
+        dwell_times: Iterable[Optional[float]],
+        flight_times: Iterable[Optional[float]],
+    ) -> "KeystrokeColumns":
+        """Build from per-column sequences (None for missing timings)."""
+        return cls(
+            event_types=np.array(event_types, dtype=np.int8),
+            key_codes=np.array(key_codes, dtype=np.int64),
+            sequence_nums=np.array(sequence_nums, dtype=np.int64),
+            # float64 conversion turns None into NaN
+            dwell_times=np.array(dwell_times, dtype=np.float64),
+            flight_times=np.array(flight_times, dtype=np.float64),
+        )
+
+    @classmethod
+    def from_keystrokes(cls, keystrokes: list[ProcessedKeystroke]) -> "KeystrokeColumns":
+        """Build from keystroke objects."""
+        return cls.from_lists(
+            [k.event_type for k in keystrokes],
+            [k.key_code for k in keystrokes],
+            [k.sequence_num for k in keystrokes],
+            [k.dwell_time for k in keystrokes],
+            [k.flight_time for k in keystrokes],
+        )
+
+
 class KeystrokeService:
     """Service for processing and storing keystroke data."""
 
@@ -131,6 +197,24 @@ class KeystrokeService:
             for row in rows
         ]
 
+    async def get_session_keystroke_columns(self, session_id: UUID) -> KeystrokeColumns:
+        """
+        Retrieve a session's keystrokes as column arrays.
+
+        Only the columns verification needs are fetched, aggregated into one
+        array per column by the database, with no per-row objects.
+        """
+        async with get_connection() as conn:
+            row = await conn.fetchrow(queries.GET_SESSION_KEYSTROKE_COLUMNS, session_id)
+
+        return KeystrokeColumns.from_lists(
+            row["event_types"] or [],
+            row["key_codes"] or [],
+            row["sequence_nums"] or [],
+            row["dwell_times"] or [],
+            row["flight_times"] or [],
+        )
+
 
 # Singleton instance
 keystroke_service = KeystrokeService()
@@ -1,6 +1,8 @@
 """ML inference service using ONNX Runtime."""
 
+import logging
 import os
+import threading
 from typing import Any, Optional
 
 import numpy as np
@@ -8,6 +10,8 @@ import onnxruntime as ort
 
 from app.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 # Multi-class labels
 CLASSES = [
     "human_organic",
@@ -18,6 +22,14 @@ CLASSES = [
     "human_coding",
 ]
 
+# ONNX output element types -> numpy dtypes for preallocated output buffers
+_ONNX_DTYPES = {
+    "tensor(float)": np.float32,
+    "tensor(double)": np.float64,
+    "tensor(int64)": np.int64,
+    "tensor(int32)": np.int32,
+}
+
 
 class MLInferenceService:
     """Service for running ONNX model inference."""
@@ -26,6 +38,11 @@ class MLInferenceService:
         self._session: Optional[ort.InferenceSession] = None
         self._settings = get_settings()
         self._is_multiclass = False
+        self._input_name = ""
+        self._num_features = 0
+        # Per-thread IOBinding with reusable output buffers (bindings are
+        # not safe to share between threads)
+        self._local = threading.local()
 
     def _load_model(self) -> None:
         """Load ONNX model into memory."""
@@ -39,7 +56,9 @@ class MLInferenceService:
         sess_options.graph_optimization_level = (
             ort.GraphOptimizationLevel.ORT_ENABLE_ALL
         )
-        sess_options.intra_op_num_threads = 2
+        # One row per call; intra-op threads only add sync overhead at this
+        # size, and concurrency comes from serving requests in parallel
+        sess_options.intra_op_num_threads = 1
 
         self._session = ort.InferenceSession(
             model_path,
@@ -53,6 +72,39 @@ class MLInferenceService:
             if proba_shape and len(proba_shape) > 1 and proba_shape[1] == 6:
                 self._is_multiclass = True
 
+        # Input metadata is fixed for the session; look it up once
+        model_input = self._session.get_inputs()[0]
+        self._input_name = model_input.name
+        self._num_features = model_input.shape[1]
+        self._local = threading.local()
+
+    def _create_binding(self) -> tuple[ort.IOBinding, list[ort.OrtValue]]:
+        """IOBinding for single-row multi-class inference, outputs preallocated."""
+        binding = self.session.io_binding()
+        shapes = [[1], [1, len(CLASSES)]]  # label, probabilities
+        outputs = []
+        for output, shape in zip(self.session.get_outputs(), shapes):
+            value = ort.OrtValue.ortvalue_from_shape_and_type(
+                shape, _ONNX_DTYPES[output.type]
+            )
+            binding.bind_ortvalue_output(output.name, value)
+            outputs.append(value)
+        return binding, outputs
+
+    def _run(self, features: np.ndarray) -> list[np.ndarray]:
+        """Run the model on one feature row."""
+        if not self._is_multiclass:
+            return self.session.run(None, {self._input_name: features})
+
+        cached = getattr(self._local, "binding", None)
+        if cached is None:
+            cached = self._local.binding = self._create_binding()
+        binding, outputs = cached
+
+        binding.bind_cpu_input(self._input_name, np.ascontiguousarray(features))
+        self.session.run_with_iobinding(binding)
+        return [value.numpy() for value in outputs]
+
     @property
     def session(self) -> ort.InferenceSession:
         """Get or create inference session."""
@@ -79,15 +131,12 @@ class MLInferenceService:
             if self._session is None:
                 self._load_model()
 
-            input_name = self.session.get_inputs()[0].name
-            expected_features = self.session.get_inputs()[0].shape[1]
-
-            if features.shape[1] != expected_features:
+            if features.shape[1] != self._num_features:
                 raise ValueError(
-                    f"Feature mismatch: model expects {expected_features} features, got {features.shape[1]}"
+                    f"Feature mismatch: model expects {self._num_features} features, got {features.shape[1]}"
                 )
 
-            outputs = self.session.run(None, {input_name: features})
+            outputs = self._run(features)
 
             if self._is_multiclass:
                 # Multi-class model
@@ -127,14 +176,11 @@ class MLInferenceService:
                 }
 
         except Exception as e:
-            print(f"[ERROR] ML inference failed: {e}")
-            print(
-                f"[ERROR] Feature shape: {features.shape if features is not None else 'None'}"
+            logger.exception(
+                "ML inference failed (feature shape %s, model loaded %s)",
+                getattr(features, "shape", None),
+                self._session is not None,
             )
-            print(f"[ERROR] Model loaded: {self._session is not None}")
-            import traceback
-
-            traceback.print_exc()
 
             return {
                 "class_id": -1,
@@ -167,11 +213,8 @@ class MLInferenceService:
             dummy_features = np.zeros((1, num_features), dtype=np.float32)
             result = self.predict(dummy_features)
             print(f"[INFO] Warmup result: {result.get('class_label', 'unknown')}")
-        except Exception as e:
-            print(f"[WARNING] Model warmup failed: {e}")
-            import traceback
-
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Model warmup failed")
 
 
 # Singleton instance